@@ -1,25 +1,123 @@
+import argparse
+import os
+import sys
+
 import pygame
 
 from .app.screen import create_screen
 from .app.scripts import event_scripts
 from .app.scripts import no_event_scripts
+from .app.core.replay import EventRecorder, replay
+from .app.core.assets import BUNDLE_PATH, build_bundle, use_bundle
+from .app.core.widgets import Audio, Image
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="PyScript App")
+    parser.add_argument('--record', metavar='FILE', help="ghi lại các sự kiện vào tệp / record the events to a file")
+    parser.add_argument('--replay', metavar='FILE', help="phát lại tệp sự kiện không cần cửa sổ / replay an event log "
+                                                         "headlessly")
+    parser.add_argument('--real-time', action='store_true', help="phát lại theo tốc độ đã ghi / replay at the "
+                                                                 "recorded speed")
+    parser.add_argument('--hash-frames', metavar='FILE', help="lưu mã băm các khung hình / save the frame hashes")
+    parser.add_argument('--reference', metavar='FILE', help="so sánh với mã băm tham chiếu / compare against "
+                                                            "reference hashes")
+    parser.add_argument('--build-assets', nargs='?', const=BUNDLE_PATH, metavar='FILE',
+                        help="đóng gói hình ảnh và âm thanh vào bundle / pack images and sounds into a bundle")
+    # Cổng mặc định của app/core/streaming.py (không nhập module để khởi động nhanh hơn và không cần numpy)
+    parser.add_argument('--stream', nargs='?', const='5901', metavar='[HOST:]PORT',
+                        help="phát khung hình qua TCP / stream the frames over TCP")
+    parser.add_argument('--connect', metavar='[HOST:]PORT', help="xem một luồng khung hình / view a frame stream")
+    parser.add_argument('--seconds', type=float, help="đo luồng khung hình trong số giây này rồi thoát, không mở cửa "
+                                                      "sổ / measure the frame stream for this many seconds and exit, "
+                                                      "without a window")
+    return parser.parse_args(argv)
+
+
+def run_build_assets(args):
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    pygame.init()
+
+    index = build_bundle(args.build_assets, Image.IMAGE_DIRECTORY, Audio.SOUND_DIRECTORY)
+    print(f"{len(index['images'])} images, {len(index['sounds'])} sounds -> {args.build_assets}")
+
+
+def run_replay(args):
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.init()
+
+    screen = create_screen()
+    screen.offscreen = True
+
+    stats = replay(args.replay, screen, event_scripts, no_event_scripts, real_time=args.real_time,
+                   hash_frames=args.hash_frames is not None, reference=args.reference)
+    if args.hash_frames:
+        stats.save_hashes(args.hash_frames)
+    for key, value in stats.summary().items():
+        print(f"{key}: {value:.3f}" if isinstance(value, float) else f"{key}: {value}")
+
+
+def run_connect(args):
+    if args.seconds is not None:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.init()
+
+    from .app.core.streaming import run_client
+    try:
+        stats = run_client(args.connect, seconds=args.seconds, view=args.seconds is None)
+    except ConnectionError as error:
+        sys.exit(str(error))
+    for key, value in stats.items():
+        print(f"{key}: {value:.3f}" if isinstance(value, float) else f"{key}: {value}")
+
 
+def main(argv=None):
+    args = parse_args(argv)
+    if args.build_assets:
+        run_build_assets(args)
+        return
+    if args.connect:
+        run_connect(args)
+        return
+    if os.path.exists(BUNDLE_PATH):
+        use_bundle(BUNDLE_PATH)
+    if args.replay:
+        run_replay(args)
+        return
 
-def main():
     pygame.init()
 
     screen = create_screen()
 
     clock = pygame.time.Clock()
 
-    while True:
-        for event in pygame.event.get():
-            event_scripts(event)
-        no_event_scripts()
+    recorder = EventRecorder(args.record) if args.record else None
+    streamer = None
+    if args.stream:
+        from .app.core.streaming import FrameStreamer, parse_address
+        host, port = parse_address(args.stream)
+        streamer = FrameStreamer(host, port).start()
+    try:
+        while True:
+            if recorder:
+                recorder.next_frame()
+            for event in pygame.event.get():
+                if recorder:
+                    recorder.record(event)
+                event_scripts(event)
+            no_event_scripts()
 
-        screen.print()
-        pygame.display.flip()
-        clock.tick(60)
+            surface = screen.print()
+            if streamer:
+                streamer.publish(surface)
+            pygame.display.flip()
+            clock.tick(60)
+    finally:
+        if recorder:
+            recorder.close()
+        if streamer:
+            streamer.stop()
 
 
 if __name__ == "__main__":
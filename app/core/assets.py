@@ -0,0 +1,216 @@
+import json
+import mmap
+import os
+import struct
+import warnings
+
+import pygame
+
+
+MAGIC = b'PYSBNDL1'
+HEADER = struct.Struct('<8sI')
+ALIGNMENT = 64
+
+BUNDLE_PATH = os.path.join(os.path.dirname(__file__) + "/..", 'static', 'assets.bundle')
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tga', '.webp')
+SOUND_EXTENSIONS = ('.ogg', '.wav', '.mp3', '.flac')
+
+_bundle = None
+
+
+def _asset_files(directory, extensions):
+    """
+    Liệt kê các tệp tài nguyên trong thư mục (kể cả thư mục con) theo tên tương đối.
+    List the asset files in a directory (including subfolders) by relative name.
+    """
+    for folder, _, filenames in os.walk(directory):
+        for filename in sorted(filenames):
+            if filename.lower().endswith(extensions):
+                path = os.path.join(folder, filename)
+                yield _asset_name(os.path.relpath(path, directory)), path
+
+
+def _asset_name(filename):
+    return filename.replace(os.sep, '/')
+
+
+def _source_stamp(path):
+    """
+    Trả về kích thước và thời điểm sửa đổi của tệp nguồn, dùng để phát hiện bundle đã cũ.
+    Return the size and modification time of a source file, used to detect a stale bundle.
+    """
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def build_bundle(output, image_directory, sound_directory):
+    """
+    Đóng gói hình ảnh và âm thanh đã giải mã sẵn vào một tệp bundle duy nhất.
+    Pack pre-decoded images and sounds into a single bundle file.
+    Hình ảnh được lưu dưới dạng điểm ảnh RGBA, âm thanh dưới dạng PCM theo định dạng hiện tại của mixer.
+    Images are stored as RGBA pixels, sounds as PCM in the current mixer format.
+    Parameters:
+        output (str): Đường dẫn tệp bundle cần tạo.
+        image_directory (str): Thư mục hình ảnh (ví dụ Image.IMAGE_DIRECTORY).
+        sound_directory (str): Thư mục âm thanh (ví dụ Audio.SOUND_DIRECTORY).
+    Returns:
+        dict: Chỉ mục của bundle.
+    """
+    blobs = []
+    index = {'images': {}, 'sounds': {}, 'mixer': None}
+
+    for name, path in _asset_files(image_directory, IMAGE_EXTENSIONS):
+        image = pygame.image.load(path)
+        index['images'][name] = {'size': list(image.get_size()), 'source': _source_stamp(path)}
+        blobs.append((index['images'][name], pygame.image.tobytes(image, 'RGBA')))
+
+    sounds = list(_asset_files(sound_directory, SOUND_EXTENSIONS))
+    if sounds:
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        index['mixer'] = list(pygame.mixer.get_init())
+        for name, path in sounds:
+            index['sounds'][name] = {'source': _source_stamp(path)}
+            blobs.append((index['sounds'][name], pygame.mixer.Sound(path).get_raw()))
+
+    # Tính vị trí dữ liệu sau phần chỉ mục; độ dài chỉ mục phụ thuộc vào các vị trí nên tính lặp tới khi ổn định
+    index_length = 0
+    while True:
+        offset = _align(HEADER.size + index_length)
+        for entry, data in blobs:
+            entry['offset'] = offset
+            entry['length'] = len(data)
+            offset = _align(offset + len(data))
+        index_bytes = json.dumps(index, separators=(',', ':')).encode('utf-8')
+        if len(index_bytes) == index_length:
+            break
+        index_length = len(index_bytes)
+
+    with open(output, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, len(index_bytes)))
+        file.write(index_bytes)
+        for entry, data in blobs:
+            file.write(b'\0' * (entry['offset'] - file.tell()))
+            file.write(data)
+    return index
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class AssetBundle:
+    """
+    Lớp AssetBundle ánh xạ tệp bundle vào bộ nhớ và tạo bề mặt, âm thanh trực tiếp từ dữ liệu đã giải mã.
+    The AssetBundle class memory-maps a bundle file and creates surfaces and sounds straight from the decoded data.
+    """
+
+    def __init__(self, filename):
+        """
+        Mở và ánh xạ tệp bundle.
+        Open and memory-map a bundle file.
+        Parameters:
+            filename (str): Đường dẫn tệp bundle.
+        """
+        with open(filename, 'rb') as file:
+            # ACCESS_COPY: các trang chỉ được đọc khi cần và việc vẽ lên bề mặt không ghi ngược vào tệp
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+        magic, index_length = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise ValueError(f"'{filename}' không phải tệp bundle.")
+        self.index = json.loads(self._mmap[HEADER.size:HEADER.size + index_length].decode('utf-8'))
+        self._view = memoryview(self._mmap)
+        self._sounds = {}
+        # Kết quả kiểm tra tệp rời theo tên: chỉ kiểm tra hệ thống tệp một lần cho mỗi tài nguyên
+        # Loose file check result by name: the file system is only checked once per asset
+        self._stale = {}
+
+    def _data(self, entry):
+        return self._view[entry['offset']:entry['offset'] + entry['length']]
+
+    def _is_stale(self, name, entry, path):
+        """
+        Kiểm tra tệp rời đã thay đổi so với lúc đóng gói hay chưa. Kết quả được lưu theo tên nên hệ thống tệp
+        chỉ được truy cập một lần cho mỗi tài nguyên; cảnh báo một lần cho mỗi tệp.
+        Check whether the loose file changed since the bundle was built. The result is kept by name so the file
+        system is only accessed once per asset; warn once per file.
+        Parameters:
+            name (str): Tên tài nguyên trong bundle.
+            entry (dict): Mục chỉ mục của tài nguyên.
+            path (str): Đường dẫn tệp rời, hoặc None nếu không kiểm tra.
+        Returns:
+            bool: True nếu nên dùng tệp rời thay cho dữ liệu trong bundle.
+        """
+        if path is None:
+            return False
+        stale = self._stale.get(name)
+        if stale is not None:
+            return stale
+        # Không có tệp rời (chỉ phân phối bundle): dữ liệu trong bundle là nguồn duy nhất
+        stale = os.path.exists(path) and _source_stamp(path) != entry.get('source')
+        self._stale[name] = stale
+        if not stale:
+            return False
+        warnings.warn(f"'{path}' đã thay đổi sau khi đóng gói bundle, dùng tệp rời thay thế "
+                      f"(chạy lại --build-assets để cập nhật). / '{path}' changed after the bundle was built, "
+                      f"using the loose file instead (run --build-assets again to update it).", stacklevel=3)
+        return True
+
+    def image(self, filename, path=None):
+        """
+        Trả về bề mặt dùng chung bộ nhớ với bundle, hoặc None nếu hình ảnh không có trong bundle
+        hoặc tệp rời đã thay đổi sau khi đóng gói.
+        Return a surface sharing memory with the bundle, or None if the image is not in the bundle
+        or the loose file changed after the bundle was built.
+        Parameters:
+            filename (str): Tên tệp hình ảnh (không bao gồm đường dẫn tới thư mục "images").
+            path (str): Đường dẫn tệp rời tương ứng, dùng để phát hiện bundle đã cũ.
+        """
+        name = _asset_name(filename)
+        entry = self.index['images'].get(name)
+        if entry is None or self._is_stale(name, entry, path):
+            return None
+        return pygame.image.frombuffer(self._data(entry), entry['size'], 'RGBA')
+
+    def sound(self, filename, path=None):
+        """
+        Trả về âm thanh tạo từ dữ liệu PCM trong bundle, hoặc None nếu không có trong bundle, tệp rời đã thay đổi
+        sau khi đóng gói hoặc mixer đang dùng định dạng khác với lúc đóng gói.
+        Return a sound created from the PCM data in the bundle, or None if it is not in the bundle, the loose file
+        changed after the bundle was built or the mixer uses a different format than when the bundle was built.
+        Parameters:
+            filename (str): Tên tệp âm thanh (không bao gồm đường dẫn tới thư mục "sounds").
+            path (str): Đường dẫn tệp rời tương ứng, dùng để phát hiện bundle đã cũ.
+        """
+        name = _asset_name(filename)
+        entry = self.index['sounds'].get(name)
+        if entry is None or self._is_stale(name, entry, path):
+            return None
+        if name not in self._sounds:
+            if list(pygame.mixer.get_init() or ()) != self.index['mixer']:
+                return None
+            self._sounds[name] = pygame.mixer.Sound(buffer=self._data(entry))
+        return self._sounds[name]
+
+
+def use_bundle(filename=BUNDLE_PATH):
+    """
+    Dùng tệp bundle làm nguồn tài nguyên cho Image và Audio.
+    Use a bundle file as the asset source for Image and Audio.
+    Parameters:
+        filename (str): Đường dẫn tệp bundle.
+    Returns:
+        AssetBundle: Bundle đang được dùng.
+    """
+    global _bundle
+    _bundle = AssetBundle(filename)
+    return _bundle
+
+
+def active_bundle():
+    """
+    Trả về bundle đang được dùng, hoặc None.
+    Return the bundle in use, or None.
+    """
+    return _bundle
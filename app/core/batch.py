@@ -0,0 +1,454 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+
+from .memory import surface_bytes, tracker
+from .pool import pool
+from .widgets import Widget
+
+
+class StampCache:
+    """
+    Lớp StampCache giữ các bề mặt mẫu (stamp) đã vẽ sẵn của ShapeBatch, loại bỏ stamp lâu nhất chưa dùng (LRU).
+    The StampCache class keeps the prerendered ShapeBatch stamps, evicting the least recently used one.
+    Được đăng ký với bộ theo dõi bộ nhớ để bị thu nhỏ khi vượt ngân sách.
+    It is registered with the memory tracker so it is trimmed when over budget.
+    """
+
+    def __init__(self, max_stamps=4096):
+        """
+        Khởi tạo bộ nhớ đệm.
+        Initialize the cache.
+        Parameters:
+            max_stamps (int): Số stamp tối đa được giữ lại.
+        """
+        self.max_stamps = max_stamps
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._stamps = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._stamps)
+
+    def get(self, key, factory):
+        """
+        Trả về stamp theo khóa, tạo bằng factory() nếu chưa có.
+        Return the stamp for a key, creating it with factory() if missing.
+        """
+        with self._lock:
+            stamp = self._stamps.get(key)
+            if stamp is not None:
+                self._stamps.move_to_end(key)
+                self.hits += 1
+                return stamp
+            self.misses += 1
+        stamp = factory()
+        with self._lock:
+            if key not in self._stamps:
+                self._stamps[key] = stamp
+                self.bytes += surface_bytes(stamp)
+                while len(self._stamps) > self.max_stamps:
+                    self.bytes -= surface_bytes(self._stamps.popitem(last=False)[1])
+        return stamp
+
+    def trim(self, target_bytes=0):
+        """
+        Loại bỏ các stamp lâu nhất chưa dùng cho tới khi dung lượng không vượt quá target_bytes.
+        Evict the least recently used stamps until the size is no more than target_bytes.
+        Returns:
+            int: Số byte đã giải phóng.
+        """
+        freed = 0
+        with self._lock:
+            while self._stamps and self.bytes > target_bytes:
+                size = surface_bytes(self._stamps.popitem(last=False)[1])
+                self.bytes -= size
+                freed += size
+        return freed
+
+    def clear(self):
+        self.trim(0)
+
+
+class ShapeBatch(Widget):
+    """
+    Lớp ShapeBatch vẽ một số lượng lớn hình chữ nhật và hình tròn trong một widget duy nhất.
+    The ShapeBatch class draws a large number of rectangles and circles in a single widget.
+    Vị trí, kích thước và màu được lưu trong các mảng NumPy liên tục và được cập nhật theo kiểu vector hóa.
+    Positions, sizes and colors are stored in contiguous NumPy arrays and updated with vectorized operations.
+    """
+
+    __slots__ = ('width', 'height', 'background_color', 'count', '_positions', '_sizes', '_colors', '_kinds')
+
+    RECT = 0
+    CIRCLE = 1
+
+    # Các bề mặt mẫu (stamp) được vẽ sẵn, dùng chung cho mọi ShapeBatch
+    # Prerendered stamps shared by every ShapeBatch
+    _stamps = StampCache()
+
+    # Tọa độ các điểm ảnh được phủ của từng hình (loại, rộng, cao), dùng khi ghi điểm ảnh trực tiếp
+    # Covered pixel offsets of each shape (kind, width, height), used when writing pixels directly
+    _masks = {}
+    MAX_MASKS = 1024
+
+    # Số điểm ảnh tối đa được ghi trong một lượt, giới hạn bộ nhớ tạm của các mảng chỉ số
+    # Maximum number of pixels written per pass, bounding the temporary index arrays
+    PIXELS_PER_PASS = 1 << 20
+
+    # Lề tối đa của bản sao dùng khi vẽ hình nằm một phần ngoài bề mặt; hình lớn hơn được cắt theo từng điểm ảnh
+    # Maximum margin of the copy used for shapes partly outside the surface; larger shapes are clipped per pixel
+    MAX_PAD = 64
+
+    def __init__(self, width, height, background_color=None, capacity=1024, id=None):
+        """
+        Khởi tạo một batch hình mới.
+        Initializes a new shape batch.
+        Parameters:
+            width (int): Chiều rộng của widget.
+            height (int): Chiều cao của widget.
+            background_color (pygame.Color): Màu nền (None cho nền trong suốt).
+            capacity (int): Số hình được cấp phát sẵn.
+            id (str): ID của widget.
+        """
+        super().__init__(id)
+        # Các mảng có thể được sửa trực tiếp nên batch được vẽ lại mỗi khung hình
+        self.static = False
+        self.width = width
+        self.height = height
+        self.background_color = background_color
+        self.count = 0
+        self._positions = np.zeros((capacity, 2), dtype=np.float32)
+        self._sizes = np.zeros((capacity, 2), dtype=np.int32)
+        self._colors = np.zeros((capacity, 4), dtype=np.uint8)
+        self._kinds = np.zeros(capacity, dtype=np.uint8)
+
+    @property
+    def positions(self):
+        """
+        Mảng (n, 2) vị trí góc trên bên trái của các hình (có thể sửa trực tiếp).
+        The (n, 2) array of top-left positions of the shapes (can be modified in place).
+        """
+        return self._positions[:self.count]
+
+    @property
+    def sizes(self):
+        """
+        Mảng (n, 2) kích thước của các hình. Hình tròn dùng đường kính.
+        The (n, 2) array of shape sizes. Circles use their diameter.
+        """
+        return self._sizes[:self.count]
+
+    @property
+    def colors(self):
+        """
+        Mảng (n, 4) màu RGBA của các hình.
+        The (n, 4) array of RGBA colors of the shapes.
+        """
+        return self._colors[:self.count]
+
+    @property
+    def kinds(self):
+        """
+        Mảng (n,) loại hình (ShapeBatch.RECT hoặc ShapeBatch.CIRCLE).
+        The (n,) array of shape kinds (ShapeBatch.RECT or ShapeBatch.CIRCLE).
+        """
+        return self._kinds[:self.count]
+
+    def _reserve(self, extra):
+        """
+        Mở rộng các mảng để chứa thêm `extra` hình.
+        Grow the arrays to hold `extra` more shapes.
+        """
+        needed = self.count + extra
+        capacity = len(self._kinds)
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2)
+        for name in ('_positions', '_sizes', '_colors', '_kinds'):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def add_many(self, kind, positions, sizes, colors):
+        """
+        Thêm nhiều hình cùng loại.
+        Add many shapes of the same kind.
+        Parameters:
+            kind (int): ShapeBatch.RECT hoặc ShapeBatch.CIRCLE.
+            positions (array-like): Mảng (n, 2) vị trí.
+            sizes (array-like): Mảng (n, 2) kích thước, một kích thước (width, height) dùng chung,
+                hoặc (n,) đường kính cho hình tròn.
+            colors (array-like): Mảng (n, 3) hoặc (n, 4) màu, hoặc một màu dùng chung.
+        Returns:
+            numpy.ndarray: Chỉ số của các hình vừa thêm.
+        """
+        positions = np.asarray(positions, dtype=np.float32).reshape(-1, 2)
+        n = len(positions)
+        shared = isinstance(sizes, tuple) and len(sizes) == 2
+        sizes = np.asarray(sizes, dtype=np.int32)
+        if sizes.ndim == 1 and (shared or len(sizes) != n):
+            # Một kích thước (width, height) dùng chung cho mọi hình, giống như một màu dùng chung
+            sizes = sizes.reshape(1, 2)
+        elif sizes.ndim < 2:
+            sizes = np.broadcast_to(sizes.reshape(-1, 1), (n, 2))
+        colors = np.asarray(colors, dtype=np.uint8)
+        if colors.shape[-1] == 3:
+            colors = np.concatenate([colors, np.full(colors.shape[:-1] + (1,), 255, dtype=np.uint8)], axis=-1)
+
+        self._reserve(n)
+        start, end = self.count, self.count + n
+        self._positions[start:end] = positions
+        self._sizes[start:end] = sizes
+        self._colors[start:end] = colors
+        self._kinds[start:end] = kind
+        self.count = end
+        return np.arange(start, end)
+
+    def add(self, kind, location, size, color):
+        """
+        Thêm một hình.
+        Add a single shape.
+        Parameters:
+            kind (int): ShapeBatch.RECT hoặc ShapeBatch.CIRCLE.
+            location (tuple): Vị trí góc trên bên trái.
+            size (tuple or int): Kích thước (width, height) hoặc đường kính.
+            color (pygame.Color): Màu của hình.
+        Returns:
+            int: Chỉ số của hình vừa thêm.
+        """
+        return int(self.add_many(kind, [location], [size], [tuple(pygame.Color(color))])[0])
+
+    def remove(self, indices):
+        """
+        Xóa các hình theo chỉ số. Chỉ số của các hình phía sau sẽ bị dịch lên.
+        Remove shapes by index. The indices of the following shapes shift down.
+        Parameters:
+            indices (array-like): Chỉ số hoặc mặt nạ boolean của các hình cần xóa.
+        """
+        keep = np.ones(self.count, dtype=bool)
+        keep[indices] = False
+        n = int(keep.sum())
+        for name in ('_positions', '_sizes', '_colors', '_kinds'):
+            array = getattr(self, name)
+            array[:n] = array[:self.count][keep]
+        self.count = n
+
+    def clear(self):
+        """
+        Xóa tất cả các hình.
+        Remove all shapes.
+        """
+        self.count = 0
+
+    def move(self, dx, dy, indices=slice(None)):
+        """
+        Dịch chuyển các hình.
+        Move shapes.
+        Parameters:
+            dx (float or array-like): Độ dịch theo trục x.
+            dy (float or array-like): Độ dịch theo trục y.
+            indices: Chỉ số hoặc mặt nạ của các hình cần dịch (mặc định là tất cả).
+        """
+        positions = self.positions
+        positions[indices, 0] += dx
+        positions[indices, 1] += dy
+
+    def clone(self, id=None):
+        widget = super().clone(id)
+        for name in ('_positions', '_sizes', '_colors', '_kinds'):
+            setattr(widget, name, getattr(self, name).copy())
+        return widget
+
+    def _allocate_surfaces(self):
+        flags = pygame.SRCALPHA if self.background_color is None else 0
+        self.SURFACE = pool.acquire((self.width, self.height), flags)
+
+    @classmethod
+    def _make_stamp(cls, kind, width, height, color):
+        """
+        Vẽ bề mặt mẫu cho một hình.
+        Draw the stamp surface for a shape.
+        """
+        if kind == cls.CIRCLE:
+            stamp = pygame.Surface((width, height), pygame.SRCALPHA)
+            pygame.draw.ellipse(stamp, color, stamp.get_rect())
+        else:
+            stamp = pygame.Surface((width, height), pygame.SRCALPHA if color[3] < 255 else 0)
+            stamp.fill(color)
+        return stamp
+
+    @classmethod
+    def _stamp(cls, key, kind, width, height, color):
+        """
+        Trả về bề mặt mẫu đã vẽ sẵn (lưu đệm) cho một hình.
+        Return the prerendered (cached) stamp surface for a shape.
+        """
+        return cls._stamps.get(key, lambda: cls._make_stamp(kind, width, height, color))
+
+    @classmethod
+    def _mask(cls, kind, width, height):
+        """
+        Trả về tọa độ (dx, dy) các điểm ảnh mà một hình phủ, giống hệt điểm ảnh của stamp tương ứng.
+        Return the (dx, dy) offsets of the pixels a shape covers, identical to the pixels of its stamp.
+        """
+        key = (kind, width, height)
+        offsets = cls._masks.get(key)
+        if offsets is None:
+            if kind == cls.CIRCLE:
+                covered = pygame.surfarray.array_alpha(cls._make_stamp(kind, width, height, (255, 255, 255))) > 0
+            else:
+                covered = np.ones((width, height), dtype=bool)
+            offsets = tuple(axis.astype(np.int32) for axis in np.nonzero(covered))
+            if len(cls._masks) >= cls.MAX_MASKS:
+                # Bỏ mặt nạ được tạo sớm nhất
+                del cls._masks[next(iter(cls._masks))]
+            cls._masks[key] = offsets
+        return offsets
+
+    def _draw_pixels(self, kinds, positions, sizes, colors):
+        """
+        Ghi màu của từng hình trực tiếp vào điểm ảnh của bề mặt bằng các phép toán vector hóa (surfarray).
+        Dùng khi hầu hết các hình có màu riêng, nên stamp không được dùng lại. Thứ tự vẽ được giữ nguyên.
+        Write the color of every shape straight into the surface pixels with vectorized operations (surfarray).
+        Used when most shapes have their own color, so stamps would not be reused. The drawing order is kept.
+        Returns:
+            bool: False nếu bề mặt hoặc màu không hỗ trợ cách vẽ này (không phải 32 bit, hoặc có hình trong suốt).
+        """
+        surface = self.SURFACE
+        if surface.get_bytesize() != 4 or (colors[:, 3] < 255).any():
+            return False
+
+        # Màu được đóng gói theo định dạng điểm ảnh của bề mặt
+        shifts, losses = surface.get_shifts(), surface.get_losses()
+        channels = 4 if surface.get_flags() & pygame.SRCALPHA else 3
+        wide = colors.astype(np.uint32)
+        packed = np.zeros(len(colors), dtype=np.uint32)
+        for channel in range(channels):
+            packed |= (wide[:, channel] >> losses[channel]) << shifts[channel]
+
+        # Bảng tọa độ của mọi hình (loại, kích thước) khác nhau, nối liền nhau
+        shape_keys = (kinds.astype(np.int64) << 32) | (sizes[:, 0].astype(np.int64) << 16) | sizes[:, 1]
+        _, first, group = np.unique(shape_keys, return_index=True, return_inverse=True)
+        group = group.ravel()
+        masks = [self._mask(int(kinds[i]), int(sizes[i, 0]), int(sizes[i, 1])) for i in first]
+        counts = np.array([len(dx) for dx, _ in masks], dtype=np.int64)
+        table_x = np.concatenate([dx for dx, _ in masks])
+        table_y = np.concatenate([dy for _, dy in masks])
+
+        # Hình nằm một phần ngoài bề mặt được vẽ lên một bản sao có lề để không phải cắt từng điểm ảnh
+        x0, y0 = positions[:, 0].astype(np.int64), positions[:, 1].astype(np.int64)
+        clip = ((x0 < 0).any() or (y0 < 0).any() or (x0 + sizes[:, 0] > self.width).any()
+                or (y0 + sizes[:, 1] > self.height).any())
+        pad = int(sizes.max()) if clip else 0
+        pixels = pygame.surfarray.pixels2d(surface)
+        try:
+            if pad > self.MAX_PAD:
+                canvas, pad, exact = pixels.T, 0, True
+            elif pad:
+                canvas = np.empty((self.height + 2 * pad, self.width + 2 * pad), dtype=np.uint32)
+                canvas[pad:pad + self.height, pad:pad + self.width] = pixels.T
+                exact = False
+            else:
+                canvas, exact = pixels.T, False
+            # Chỉ số phẳng: hàng (row) tính theo số phần tử uint32
+            row = canvas.strides[0] // 4
+            flat_canvas = np.lib.stride_tricks.as_strided(canvas, (canvas.shape[0] * row,), (4,))
+            offsets = table_y.astype(np.int64) * row + table_x
+            bases = (y0 + pad) * row + (x0 + pad)
+            pixel_counts = counts[group]
+            # Vị trí trong bảng tọa độ của điểm ảnh đầu tiên của mỗi hình
+            table_starts = (np.cumsum(counts) - counts)[group]
+            ends = np.cumsum(pixel_counts)
+
+            start = 0
+            while start < len(kinds):
+                # Chia các hình thành từng lượt khoảng PIXELS_PER_PASS điểm ảnh, theo đúng thứ tự
+                done = int(ends[start - 1]) if start else 0
+                stop = max(start + 1, int(np.searchsorted(ends, done + self.PIXELS_PER_PASS, side='right')))
+                repeats = pixel_counts[start:stop]
+                index = np.arange(done, int(ends[stop - 1])) + np.repeat(
+                    table_starts[start:stop] - (ends[start:stop] - repeats), repeats)
+                targets = np.repeat(bases[start:stop], repeats) + offsets[index]
+                values = np.repeat(packed[start:stop], repeats)
+                if exact:
+                    x = np.repeat(x0[start:stop], repeats) + table_x[index]
+                    y = np.repeat(y0[start:stop], repeats) + table_y[index]
+                    inside = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+                    targets, values = targets[inside], values[inside]
+                # Với chỉ số trùng nhau, giá trị ghi sau cùng (hình vẽ sau) được giữ lại
+                flat_canvas[targets] = values
+                start = stop
+            if pad:
+                pixels.T[...] = canvas[pad:pad + self.height, pad:pad + self.width]
+        finally:
+            del pixels
+        return True
+
+    def _draw_direct(self, kinds, positions, sizes, colors):
+        """
+        Vẽ từng hình trực tiếp, không dùng stamp. Chỉ dùng khi không thể ghi điểm ảnh trực tiếp (xem _draw_pixels).
+        Draw every shape directly, without stamps. Only used when pixels cannot be written directly
+        (see _draw_pixels).
+        """
+        surface = self.SURFACE
+        for kind, (x, y), (width, height), color in zip(kinds.tolist(), positions.tolist(), sizes.tolist(),
+                                                        colors.tolist()):
+            if color[3] < 255:
+                # Hình trong suốt một phần cần được trộn màu nên vẫn vẽ qua bề mặt tạm
+                surface.blit(self._make_stamp(kind, width, height, color), (x, y))
+            elif kind == self.CIRCLE:
+                pygame.draw.ellipse(surface, color, (x, y, width, height))
+            else:
+                surface.fill(color, (x, y, width, height))
+
+    def print(self):
+        """
+        Phương thức để vẽ tất cả các hình của batch.
+        Method to draw all the shapes of the batch.
+        Returns:
+            pygame.Surface: Bề mặt hiển thị của batch.
+        """
+        self._ensure_surfaces()
+        self.SURFACE.fill(self.background_color if self.background_color is not None else (0, 0, 0, 0))
+        if not self.count:
+            return self.SURFACE
+
+        positions = self.positions.astype(np.int32)
+        sizes = self.sizes
+
+        # Bỏ qua các hình nằm ngoài bề mặt
+        visible = ((positions[:, 0] < self.width) & (positions[:, 1] < self.height)
+                   & (positions[:, 0] + sizes[:, 0] > 0) & (positions[:, 1] + sizes[:, 1] > 0)
+                   & (sizes[:, 0] > 0) & (sizes[:, 1] > 0))
+        positions = positions[visible]
+        sizes = sizes[visible]
+        kinds = self.kinds[visible]
+        colors = self.colors[visible]
+
+        # Mỗi tổ hợp (loại, kích thước, màu) dùng chung một stamp
+        keys = ((kinds.astype(np.int64) << 60) | (sizes[:, 0].astype(np.int64) & 0x3FFF) << 46
+                | (sizes[:, 1].astype(np.int64) & 0x3FFF) << 32 | colors.view(np.uint32).ravel().astype(np.int64))
+        unique, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        if len(unique) > self._stamps.max_stamps or len(unique) > len(keys) // 2:
+            # Stamp ít được dùng lại (ví dụ màu riêng cho từng điểm): vẽ trực tiếp thay vì tạo lại stamp mỗi khung hình
+            if not self._draw_pixels(kinds, positions, sizes, colors):
+                self._draw_direct(kinds, positions, sizes, colors)
+            return self.SURFACE
+        stamps = [self._stamp(int(key), int(kinds[i]), int(sizes[i, 0]), int(sizes[i, 1]), tuple(colors[i].tolist()))
+                  for key, i in zip(unique, first)]
+
+        sequence = zip(map(stamps.__getitem__, inverse.ravel().tolist()), positions.tolist())
+        if hasattr(self.SURFACE, 'fblits'):
+            self.SURFACE.fblits(sequence)
+        else:
+            self.SURFACE.blits(sequence, doreturn=False)
+        return self.SURFACE
+
+
+tracker.add_cache(ShapeBatch._stamps)
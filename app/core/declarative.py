@@ -0,0 +1,225 @@
+import weakref
+
+from .widgets import *
+from .layout import Layout
+from .scene import RESERVED_KEYS, build_widget, _convert
+
+
+# Các thuộc tính chỉ được dùng trong hàm khởi tạo (tạo ra thuộc tính khác); khi chúng thay đổi widget được tạo lại
+# Props only used by the constructor (they derive other attributes); the widget is rebuilt when they change
+REPLACE_PROPS = {
+    'Image': ('image_filename',),
+    'Form': ('targeted',),
+    'Input': ('label_text', 'width', 'font_size', 'targeted', 'background_color', 'targeted_color'),
+    'Textbox': ('font_name', 'font_size'),
+}
+
+# Nút mô tả đã được áp dụng lần cuối cho từng widget
+# The description node last applied to each widget
+_applied = weakref.WeakKeyDictionary()
+
+
+def element(type, id=None, location=(0, 0), children=(), visible=True, lazy=False, grow=None, **props):
+    """
+    Tạo một nút mô tả widget, cùng định dạng với nút trong tệp scene.
+    Create a widget description node, in the same format as a scene file node.
+    Parameters:
+        type (str): Tên loại widget (xem scene.WIDGET_TYPES).
+        id (str): Khóa của widget, dùng để so khớp giữa các lần reconcile.
+        location (tuple): Vị trí trên widget cha.
+        children (list): Các nút con.
+        visible (bool): Widget có được hiển thị hay không.
+        lazy (bool): Chỉ tạo các đối tượng con khi hiển thị lần đầu.
+        grow (int): Tỷ lệ grow khi widget cha là Flex.
+        **props: Các tham số của hàm khởi tạo widget.
+    Returns:
+        dict: Nút mô tả.
+    """
+    node = dict(props, type=type, location=location, visible=visible)
+    if id is not None:
+        node['id'] = id
+    if children:
+        node['children'] = list(children)
+    if lazy:
+        node['lazy'] = True
+    if grow is not None:
+        node['grow'] = grow
+    return node
+
+
+class ReconcileStats:
+    """
+    Lớp ReconcileStats đếm các thao tác mà một lần reconcile đã thực hiện trên cây widget.
+    The ReconcileStats class counts the operations a reconcile pass applied to the widget tree.
+    """
+
+    __slots__ = ('created', 'updated', 'moved', 'removed', 'skipped')
+
+    def __init__(self):
+        self.created = 0
+        self.updated = 0
+        self.moved = 0
+        self.removed = 0
+        self.skipped = 0
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def reconcile(parent, nodes, stats=None):
+    """
+    So khớp danh sách nút mô tả với các đối tượng con hiện có của parent theo id và chỉ áp dụng các thay đổi cần
+    thiết: tạo, cập nhật thuộc tính, di chuyển, sắp xếp lại và hủy widget.
+    Diff a list of description nodes against the current children of parent by id and apply only the needed
+    changes: create, update props, move, reorder and destroy widgets.
+    Nút mô tả được coi là không thay đổi: nút giống hệt (cùng đối tượng) với lần trước thì cả cây con được bỏ qua.
+    Description nodes are treated as immutable: a node identical (same object) to the previous one skips its
+    whole subtree.
+    Parameters:
+        parent (Widget): Widget cha (ví dụ Screen()).
+        nodes (list): Các nút mô tả đối tượng con mong muốn (xem element() và định dạng tệp scene).
+        stats (ReconcileStats): Bộ đếm cần cộng dồn (mặc định tạo mới).
+    Returns:
+        ReconcileStats: Các thao tác đã thực hiện.
+    """
+    if stats is None:
+        stats = ReconcileStats()
+    if parent._deferred is not None:
+        # Các đối tượng con chưa được tạo: thay thế hàm tạo bằng mô tả mới
+        parent.defer_children(lambda widget: reconcile(widget, nodes))
+        return stats
+
+    arranged = isinstance(parent, Layout)
+    current = list(parent.children)
+    by_id = {child.id: (location, child) for location, child in current}
+    keyed = {node['id'] for node in nodes if node.get('id') is not None}
+    used = set()
+    children = []
+
+    for index, node in enumerate(nodes):
+        key = node.get('id')
+        if key is not None:
+            if key in used:
+                raise ValueError(f"ID '{key}' bị trùng trong mô tả.")
+            match = by_id.get(key)
+        else:
+            # Nút không có id được so khớp theo vị trí với đối tượng con chưa được nút nào nhận
+            match = current[index] if index < len(current) else None
+            if match is not None and (match[1].id in keyed or match[1].id in used):
+                match = None
+        if match is not None and type(match[1]).__name__ != node['type']:
+            match = None
+
+        # Vị trí trong layout do layout tính
+        location = (0, 0) if arranged else tuple(node.get('location', (0, 0)))
+        if match is None:
+            if key is not None and key in by_id:
+                # Cùng id nhưng khác loại: hủy widget cũ trước để giải phóng id
+                by_id.pop(key)[1].destroy()
+                stats.removed += 1
+            widget = _create(node, stats)
+            regrow = True
+        else:
+            previous = _applied.get(match[1])
+            regrow = previous is None or previous.get('grow') != node.get('grow')
+            widget = _patch(match[1], node, stats)
+            if widget is not match[1]:
+                by_id.pop(match[1].id, None)
+            elif not arranged and match[0] != location:
+                stats.moved += 1
+        used.add(widget.id)
+        children.append((location, widget, node, regrow))
+
+    for location, child in current:
+        if child.id not in used and by_id.get(child.id, (None, None))[1] is child:
+            child.destroy()
+            stats.removed += 1
+
+    _set_children(parent, children)
+    return stats
+
+
+def _create(node, stats):
+    """
+    Tạo widget mới (và các đối tượng con) từ nút mô tả.
+    Create a new widget (and its children) from a description node.
+    """
+    widget = build_widget({key: value for key, value in node.items() if key != 'children'})
+    stats.created += 1
+    _apply_children(widget, node, stats)
+    _applied[widget] = node
+    return widget
+
+
+def _apply_children(widget, node, stats):
+    """
+    So khớp các nút con; cây con bị ẩn hoặc "lazy" chưa được tạo thì chỉ được so khớp khi hiển thị lần đầu.
+    Reconcile the child nodes; hidden or "lazy" subtrees that are not built yet are only reconciled on first display.
+    """
+    children = node.get('children', ())
+    if children and not widget.children and (not widget.visible or node.get('lazy', False)):
+        widget.defer_children(lambda parent: reconcile(parent, children))
+    elif children or widget.children or widget._deferred is not None:
+        reconcile(widget, children, stats)
+
+
+def _patch(widget, node, stats):
+    """
+    Cập nhật một widget hiện có theo nút mô tả mới.
+    Update an existing widget to match a new description node.
+    Returns:
+        Widget: Chính widget đó, hoặc widget mới nếu phải tạo lại.
+    """
+    previous = _applied.get(widget)
+    if previous is node:
+        stats.skipped += 1
+        return widget
+
+    props = {key: value for key, value in node.items() if key not in RESERVED_KEYS}
+    if previous is None:
+        # Widget chưa được reconcile (ví dụ tạo từ tệp scene): so sánh với thuộc tính hiện tại
+        changed = {key: value for key, value in props.items() if getattr(widget, key, None) != _convert(key, value)}
+    else:
+        changed = {key: value for key, value in props.items() if key not in previous or previous[key] != value}
+    replace = REPLACE_PROPS.get(node['type'], ())
+    if any(key in replace for key in changed):
+        widget.destroy()
+        stats.removed += 1
+        return _create(node, stats)
+
+    if changed and widget.update(**{key: _convert(key, value) for key, value in changed.items()}):
+        stats.updated += 1
+    visible = node.get('visible', True)
+    if widget.visible != visible:
+        widget.visible = visible
+        stats.updated += 1
+
+    _apply_children(widget, node, stats)
+    _applied[widget] = node
+    return widget
+
+
+def _set_children(parent, children):
+    """
+    Cập nhật danh sách đối tượng con của parent. Nếu thứ tự hoặc thành phần thay đổi, danh sách được tạo lại
+    qua add_child để các layout (và grow của Flex) được cập nhật.
+    Update the child list of parent. If the order or membership changed, the list is rebuilt through add_child
+    so layouts (and Flex grow factors) are updated.
+    """
+    current = parent.children
+    same_order = len(current) == len(children) and all(
+        child is widget for (_, child), (_, widget, _, _) in zip(current, children))
+    if same_order and not any(regrow and node.get('grow') is not None for _, _, node, regrow in children):
+        if not isinstance(parent, Layout):
+            for index, (location, widget, _, _) in enumerate(children):
+                if current[index][0] != location:
+                    current[index] = (location, widget)
+                    parent.invalidate()
+        return
+
+    parent.children = ()
+    for location, widget, node, _ in children:
+        if node.get('grow') is not None:
+            parent.add_child(location, widget, grow=node['grow'])
+        else:
+            parent.add_child(location, widget)
@@ -0,0 +1,253 @@
+from abc import abstractmethod
+
+import pygame
+
+from .widgets import Container
+
+
+class Layout(Container):
+    """
+    Lớp cơ sở cho các container tự tính vị trí của đối tượng con.
+    Base class for containers that compute the locations of their children.
+    Layout chỉ được tính lại khi kích thước container hoặc kích thước đo được của các đối tượng con thay đổi.
+    The layout is only recomputed when the container size or the measured sizes of the children change.
+    """
+
+    __slots__ = ('fill', '_layout_key')
+
+    def __init__(self, width, height, background_color=pygame.Color('white'), fill=False, id=None):
+        """
+        Khởi tạo một layout mới.
+        Initialize a new layout.
+        Parameters:
+            fill (bool): Lấp đầy widget cha: layout cấp cao nhất được co giãn theo màn hình (xem Screen.resize).
+                Fill the parent: a top-level layout is resized with the screen (see Screen.resize).
+        """
+        super().__init__(width, height, background_color, id)
+        self.fill = fill
+        self._layout_key = None
+
+    def add_child(self, location, child_object):
+        """
+        Thêm một đối tượng con. Vị trí sẽ được tính bởi layout.
+        Add a child object. Its location is computed by the layout.
+        Parameters:
+            location (tuple): Bỏ qua, có thể là None.
+            child_object (Widget): Đối tượng con cần thêm.
+        """
+        super().add_child((0, 0), child_object)
+        self._layout_key = None
+
+    def resize(self, width, height):
+        super().resize(width, height)
+        self._layout_key = None
+
+    def clone(self, id=None):
+        widget = super().clone(id)
+        widget._layout_key = None
+        return widget
+
+    def update(self, **attributes):
+        # Thuộc tính như gap, padding cũng ảnh hưởng tới layout
+        changed = super().update(**attributes)
+        if changed:
+            self._layout_key = None
+        return changed
+
+    def _constraints(self):
+        """
+        Trả về các ràng buộc ảnh hưởng tới layout: kích thước container và kích thước đã đo của các đối tượng con.
+        Return the constraints that affect the layout: the container size and the measured sizes of the children.
+        """
+        return self.width, self.height, tuple((child.id, child.get_size()) for _, child in self.children)
+
+    def layout(self):
+        """
+        Sắp xếp lại các đối tượng con nếu ràng buộc đã thay đổi kể từ lần sắp xếp trước.
+        Re-arrange the children if the constraints changed since the previous layout.
+        Returns:
+            bool: True nếu layout đã được tính lại.
+        """
+        if self._layout_key is not None and self._layout_key == self._constraints():
+            return False
+        self._arrange()
+        self._layout_key = self._constraints()
+        return True
+
+    @abstractmethod
+    def _arrange(self):
+        """
+        Tính vị trí (và kích thước nếu cần) của các đối tượng con.
+        Compute the locations (and sizes if needed) of the children.
+        """
+        pass
+
+    def print(self):
+        """
+        Phương thức để sắp xếp và vẽ container cùng các đối tượng con.
+        Method to lay out and draw the container and its children.
+        Returns:
+            pygame.Surface: Bề mặt hiển thị của container.
+        """
+        self.layout()
+        return super().print()
+
+
+class Flex(Layout):
+    """
+    Lớp Flex là một container tự sắp xếp các đối tượng con theo hàng hoặc cột.
+    The Flex class is a container that arranges its children in a row or a column.
+    """
+
+    __slots__ = ('direction', 'gap', 'padding', 'align', '_grow')
+
+    def __init__(self, width, height, direction='row', gap=0, padding=0, align='start',
+                 background_color=pygame.Color('white'), fill=False, id=None):
+        """
+        Khởi tạo một container flex mới.
+        Initialize a new flex container.
+        Parameters:
+            width (int): Chiều rộng của container.
+            height (int): Chiều cao của container.
+            direction (str): Hướng sắp xếp, 'row' hoặc 'column'.
+            gap (int): Khoảng cách giữa các đối tượng con.
+            padding (int): Khoảng đệm quanh các đối tượng con.
+            align (str): Căn chỉnh theo trục phụ: 'start', 'center', 'end' hoặc 'stretch'.
+            background_color (pygame.Color): Màu nền của container.
+            fill (bool): Co giãn theo màn hình khi là layout cấp cao nhất.
+            id (str): ID của container.
+        """
+        super().__init__(width, height, background_color, fill, id)
+        if direction not in ('row', 'column'):
+            raise ValueError(f"Hướng '{direction}' không hợp lệ.")
+        self.direction = direction
+        self.gap = gap
+        self.padding = padding
+        self.align = align
+        self._grow = {}
+
+    def add_child(self, location, child_object, grow=0):
+        """
+        Thêm một đối tượng con. Vị trí sẽ được tính bởi layout.
+        Add a child object. Its location is computed by the layout.
+        Parameters:
+            location (tuple): Bỏ qua, có thể là None.
+            child_object (Widget): Đối tượng con cần thêm.
+            grow (int): Tỷ lệ chia phần không gian còn trống theo trục chính (0 là giữ kích thước).
+        """
+        super().add_child(location, child_object)
+        if grow:
+            self._grow[child_object.id] = grow
+        else:
+            self._grow.pop(child_object.id, None)
+
+    def clone(self, id=None):
+        widget = super().clone(id)
+        # Các đối tượng con của bản sao có ID mới
+        widget._grow = {clone.id: self._grow[child.id]
+                        for (_, child), (_, clone) in zip(self.children, widget.children) if child.id in self._grow}
+        return widget
+
+    def _arrange(self):
+        row = self.direction == 'row'
+        inner_main = (self.width if row else self.height) - 2 * self.padding
+        inner_cross = (self.height if row else self.width) - 2 * self.padding
+        sizes = [child.get_size() for _, child in self.children]
+
+        # Phần không gian còn trống được chia cho các đối tượng con có grow
+        fixed = sum(size[0 if row else 1] for (_, child), size in zip(self.children, sizes)
+                    if child.id not in self._grow)
+        free = max(0, inner_main - fixed - self.gap * max(0, len(self.children) - 1))
+        total_grow = sum(self._grow.get(child.id, 0) for _, child in self.children)
+
+        position = self.padding
+        for index, ((_, child), size) in enumerate(zip(self.children, sizes)):
+            main, cross = (size[0], size[1]) if row else (size[1], size[0])
+            grow = self._grow.get(child.id, 0)
+            if grow:
+                main = free * grow // total_grow
+            if self.align == 'stretch':
+                cross = inner_cross
+            if (main, cross) != ((size[0], size[1]) if row else (size[1], size[0])):
+                child.resize(*((main, cross) if row else (cross, main)))
+
+            if self.align == 'center':
+                offset = self.padding + (inner_cross - cross) // 2
+            elif self.align == 'end':
+                offset = self.padding + inner_cross - cross
+            else:
+                offset = self.padding
+            self.children[index] = ((position, offset) if row else (offset, position), child)
+            position += main + self.gap
+
+
+class Row(Flex):
+    """
+    Container flex sắp xếp các đối tượng con theo hàng ngang.
+    Flex container arranging its children in a horizontal row.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, width, height, gap=0, padding=0, align='start', background_color=pygame.Color('white'),
+                 fill=False, id=None):
+        super().__init__(width, height, 'row', gap, padding, align, background_color, fill, id)
+
+
+class Column(Flex):
+    """
+    Container flex sắp xếp các đối tượng con theo cột dọc.
+    Flex container arranging its children in a vertical column.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, width, height, gap=0, padding=0, align='start', background_color=pygame.Color('white'),
+                 fill=False, id=None):
+        super().__init__(width, height, 'column', gap, padding, align, background_color, fill, id)
+
+
+class Grid(Layout):
+    """
+    Lớp Grid là một container sắp xếp các đối tượng con vào lưới có số cột cố định.
+    The Grid class is a container arranging its children in a grid with a fixed number of columns.
+    """
+
+    __slots__ = ('columns', 'gap', 'padding', 'row_height', 'stretch')
+
+    def __init__(self, width, height, columns, gap=0, padding=0, row_height=None, stretch=False,
+                 background_color=pygame.Color('white'), fill=False, id=None):
+        """
+        Khởi tạo một container lưới mới.
+        Initialize a new grid container.
+        Parameters:
+            width (int): Chiều rộng của container.
+            height (int): Chiều cao của container.
+            columns (int): Số cột của lưới.
+            gap (int): Khoảng cách giữa các ô.
+            padding (int): Khoảng đệm quanh lưới.
+            row_height (int): Chiều cao cố định của mỗi hàng (None để dùng chiều cao lớn nhất trong hàng).
+            stretch (bool): Co giãn các đối tượng con cho vừa ô.
+            background_color (pygame.Color): Màu nền của container.
+            fill (bool): Co giãn theo màn hình khi là layout cấp cao nhất.
+            id (str): ID của container.
+        """
+        super().__init__(width, height, background_color, fill, id)
+        self.columns = columns
+        self.gap = gap
+        self.padding = padding
+        self.row_height = row_height
+        self.stretch = stretch
+
+    def _arrange(self):
+        cell_width = (self.width - 2 * self.padding - self.gap * (self.columns - 1)) // self.columns
+        y = self.padding
+        for start in range(0, len(self.children), self.columns):
+            row = self.children[start:start + self.columns]
+            row_height = self.row_height or max(child.get_size()[1] for _, child in row)
+            for column, (_, child) in enumerate(row):
+                if self.stretch and child.get_size() != (cell_width, row_height):
+                    child.resize(cell_width, row_height)
+                x = self.padding + column * (cell_width + self.gap)
+                self.children[start + column] = ((x, y), child)
+            y += row_height + self.gap
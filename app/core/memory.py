@@ -0,0 +1,234 @@
+import threading
+import weakref
+
+
+def surface_bytes(surface):
+    """
+    Trả về số byte điểm ảnh của một bề mặt.
+    Return the number of pixel bytes of a surface.
+    """
+    return surface.get_pitch() * surface.get_height()
+
+
+class SurfaceTracker:
+    """
+    Lớp SurfaceTracker theo dõi tổng dung lượng bề mặt của các widget và giải phóng bớt khi vượt ngân sách.
+    The SurfaceTracker class keeps track of the total surface memory of the widgets and evicts when over budget.
+    Chỉ các bề mặt có thể tạo lại (bề mặt widget, văn bản đã vẽ, bản co giãn) bị giải phóng; chúng được
+    tạo lại khi widget được vẽ lần tiếp theo.
+    Only regenerable surfaces (widget surfaces, text renders, scaled copies) are evicted; they are rebuilt
+    the next time the widget is drawn.
+    """
+
+    def __init__(self):
+        self.budget = None
+        self.total = 0
+        self.frame = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+        self._widgets = weakref.WeakKeyDictionary()
+        # Các widget đang bị ẩn và khung hình mà bề mặt của chúng sẽ được giải phóng, theo thứ tự bị ẩn
+        # Hidden widgets and the frame their surfaces are released at, in the order they were hidden
+        self._hidden = weakref.WeakKeyDictionary()
+        self._caches = []
+        self._lock = threading.Lock()
+
+    def set_budget(self, budget):
+        """
+        Đặt ngân sách bộ nhớ bề mặt.
+        Set the surface memory budget.
+        Parameters:
+            budget (int): Số byte tối đa, hoặc None để tắt giới hạn.
+        """
+        self.budget = budget
+
+    def add_cache(self, cache):
+        """
+        Đăng ký một bộ nhớ đệm bề mặt (có thuộc tính bytes và phương thức trim(target_bytes))
+        để được thu nhỏ khi vượt ngân sách.
+        Register a surface cache (with a bytes attribute and a trim(target_bytes) method)
+        to be trimmed when over budget.
+        """
+        self._caches.append(cache)
+
+    def _cached_bytes(self):
+        return sum(cache.bytes for cache in self._caches)
+
+    def _trim_caches(self):
+        """
+        Thu nhỏ các bộ nhớ đệm để tổng dung lượng không vượt ngân sách.
+        Trim the caches so the total does not exceed the budget.
+        """
+        for cache in self._caches:
+            cache.trim(max(0, self.budget - self.total - self._cached_bytes() + cache.bytes))
+
+    def update(self, widget):
+        """
+        Ghi nhận lại dung lượng bề mặt hiện tại của widget.
+        Record the current surface memory of the widget.
+        """
+        size = widget.surface_bytes()
+        with self._lock:
+            self.total += size - self._widgets.get(widget, 0)
+            if size:
+                self._widgets[widget] = size
+            else:
+                self._widgets.pop(widget, None)
+
+    def forget(self, widget):
+        """
+        Bỏ theo dõi widget sau khi bề mặt của nó bị giải phóng.
+        Stop tracking the widget once its surfaces are released.
+        """
+        with self._lock:
+            self.total -= self._widgets.pop(widget, 0)
+
+    def hide(self, widget, frames):
+        """
+        Ghi nhận widget vừa bị ẩn; bề mặt của nó và cây con được giải phóng nếu vẫn bị ẩn sau số khung hình đã cho.
+        Record that a widget was hidden; its surfaces and its subtree's are released if it stays hidden for the
+        given number of frames.
+        """
+        with self._lock:
+            self._hidden.pop(widget, None)
+            self._hidden[widget] = self.frame + frames
+
+    def show(self, widget):
+        """
+        Ghi nhận widget được hiển thị lại.
+        Record that a widget is shown again.
+        """
+        with self._lock:
+            self._hidden.pop(widget, None)
+
+    def _release_hidden(self):
+        """
+        Giải phóng bề mặt của các widget bị ẩn đủ lâu, không phụ thuộc vào việc widget cha có được vẽ lại hay không.
+        Release the surfaces of widgets hidden long enough, whether or not their parents are redrawn.
+        """
+        expired = []
+        with self._lock:
+            for widget, frame in self._hidden.items():
+                if frame > self.frame:
+                    break
+                expired.append(widget)
+            for widget in expired:
+                del self._hidden[widget]
+        for widget in expired:
+            widget.release_surfaces()
+
+    def bytes_of(self, widget):
+        """
+        Trả về dung lượng bề mặt đã ghi nhận của widget.
+        Return the recorded surface memory of the widget.
+        """
+        return self._widgets.get(widget, 0)
+
+    def next_frame(self):
+        """
+        Bắt đầu một khung hình mới và giải phóng bớt bề mặt nếu vượt ngân sách.
+        Start a new frame and evict surfaces if the budget is exceeded.
+        """
+        self.frame += 1
+        if self._hidden:
+            self._release_hidden()
+        if self.budget is None or self.total + self._cached_bytes() <= self.budget:
+            return
+        # Bề mặt trong bộ nhớ đệm được giải phóng trước, rồi mới tới bề mặt của widget
+        self._trim_caches()
+        if self.total > self.budget:
+            self.evict(self.budget * 9 // 10)
+            self._trim_caches()
+
+    def evict(self, target, min_idle_frames=1):
+        """
+        Giải phóng bề mặt của các widget bị ẩn trước, rồi tới các widget lâu nhất chưa được vẽ,
+        cho tới khi tổng dung lượng không vượt quá target.
+        Release the surfaces of hidden widgets first, then of the least recently drawn ones,
+        until the total is no more than target.
+        Parameters:
+            target (int): Dung lượng mục tiêu (byte).
+            min_idle_frames (int): Không giải phóng widget đã được vẽ trong số khung hình gần đây này.
+        Returns:
+            int: Số byte đã giải phóng.
+        """
+        freed = 0
+        oldest_allowed = self.frame - min_idle_frames
+        candidates = sorted((widget for widget in self._widgets if widget._last_drawn < oldest_allowed),
+                            key=lambda widget: (widget.visible, widget._last_drawn))
+        for widget in candidates:
+            if self.total <= target:
+                break
+            size = self._widgets.get(widget, 0)
+            widget._release_own_surfaces()
+            freed += size
+            self.evictions += 1
+        self.evicted_bytes += freed
+        return freed
+
+    def stats(self):
+        """
+        Trả về thống kê bộ nhớ bề mặt.
+        Return the surface memory statistics.
+        Returns:
+            dict: Tổng dung lượng, ngân sách, số widget được theo dõi, số lần và số byte đã giải phóng.
+        """
+        return {
+            'total_bytes': self.total,
+            'cached_bytes': self._cached_bytes(),
+            'budget_bytes': self.budget,
+            'widgets': len(self._widgets),
+            'evictions': self.evictions,
+            'evicted_bytes': self.evicted_bytes,
+        }
+
+
+tracker = SurfaceTracker()
+
+
+def subtree_bytes(widget):
+    """
+    Trả về tổng dung lượng bề mặt của widget và toàn bộ cây con.
+    Return the total surface memory of the widget and its whole subtree.
+    """
+    return tracker.bytes_of(widget) + sum(subtree_bytes(child) for child in _subwidgets(widget))
+
+
+def _subwidgets(widget):
+    """
+    Duyệt các đối tượng con và các widget được vẽ trực tiếp (ví dụ textbox của Input).
+    Iterate over the children and the directly drawn widgets (e.g. the textbox of an Input).
+    """
+    for _, child in widget.children:
+        yield child
+    yield from widget._parts()
+
+
+def report(root, limit=20):
+    """
+    Liệt kê các widget chiếm nhiều bộ nhớ bề mặt nhất trong cây.
+    List the widgets holding the most surface memory in the tree.
+    Parameters:
+        root (Widget): Widget gốc của cây cần kiểm tra.
+        limit (int): Số dòng tối đa.
+    Returns:
+        list: Mỗi phần tử là dict gồm id, type, own_bytes, subtree_bytes, visible, last_drawn.
+    """
+    rows = []
+
+    def visit(widget):
+        own = tracker.bytes_of(widget)
+        total = own + sum(visit(child) for child in _subwidgets(widget))
+        rows.append({
+            'id': widget.id,
+            'type': widget.__class__.__name__,
+            'own_bytes': own,
+            'subtree_bytes': total,
+            'visible': widget.visible,
+            'last_drawn': widget._last_drawn,
+        })
+        return total
+
+    visit(root)
+    rows.sort(key=lambda row: row['subtree_bytes'], reverse=True)
+    return rows[:limit]
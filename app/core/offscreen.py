@@ -0,0 +1,89 @@
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import pygame
+
+from .widgets import Screen
+from .scene import load_scene, parse_scene
+
+
+# Một công việc vẽ: scene là tên tệp scene hoặc một hàm (cấp module) trả về widget gốc;
+# output là đường dẫn tệp PNG, hoặc None để nhận về mảng NumPy.
+# A render job: scene is a scene filename or a (module-level) function returning the root widget;
+# output is a PNG file path, or None to get a NumPy array back.
+RenderJob = namedtuple('RenderJob', ['scene', 'output', 'size'], defaults=(None, None))
+
+
+def render_to_surface(widget):
+    """
+    Vẽ cây widget lên một bề mặt thường, không cần cửa sổ hiển thị.
+    Render a widget tree to a plain surface, without a display window.
+    Parameters:
+        widget (Widget): Widget gốc. Screen sẽ được chuyển sang chế độ offscreen.
+    Returns:
+        pygame.Surface: Bề mặt đã vẽ.
+    """
+    if isinstance(widget, Screen) and not widget.offscreen:
+        widget.offscreen = True
+        widget.SURFACE = None
+    return widget.print()
+
+
+def surface_to_array(surface):
+    """
+    Chuyển bề mặt thành mảng NumPy (height, width, 3) kiểu uint8.
+    Convert a surface to a (height, width, 3) uint8 NumPy array.
+    """
+    return pygame.surfarray.array3d(surface).swapaxes(0, 1)
+
+
+def render_job(job):
+    """
+    Thực hiện một công việc vẽ trong tiến trình hiện tại rồi hủy cây widget đã tạo.
+    Run one render job in the current process, then destroy the widget tree it built.
+    Parameters:
+        job (RenderJob): Công việc cần vẽ.
+    Returns:
+        str or numpy.ndarray: Đường dẫn tệp PNG hoặc mảng điểm ảnh.
+    """
+    if callable(job.scene):
+        root = job.scene()
+    else:
+        root = load_scene(job.scene, Screen(offscreen=True, **parse_scene(job.scene).get('screen', {})))
+    try:
+        if job.size is not None:
+            root.resize(*job.size)
+        surface = render_to_surface(root)
+        if job.output is None:
+            return surface_to_array(surface)
+        pygame.image.save(surface, job.output)
+        return job.output
+    finally:
+        root.destroy()
+
+
+def _init_worker():
+    """
+    Khởi tạo pygame không cần màn hình trong tiến trình con.
+    Initialize a headless pygame in a worker process.
+    """
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    pygame.display.init()
+    pygame.font.init()
+
+
+def render_batch(jobs, processes=None, chunksize=1):
+    """
+    Vẽ nhiều scene song song trên một nhóm tiến trình.
+    Render many scenes in parallel on a process pool.
+    Parameters:
+        jobs (iterable): Các RenderJob cần vẽ.
+        processes (int): Số tiến trình (mặc định bằng số CPU).
+        chunksize (int): Số công việc gửi cho mỗi tiến trình một lần.
+    Returns:
+        list: Kết quả của từng công việc theo đúng thứ tự.
+    """
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker) as executor:
+        return list(executor.map(render_job, jobs, chunksize=chunksize))
@@ -0,0 +1,135 @@
+import threading
+import weakref
+
+import pygame
+
+from .memory import surface_bytes, tracker
+
+
+class SurfacePool:
+    """
+    Lớp SurfacePool giữ lại các bề mặt đã được trả lại để dùng lại, phân nhóm theo kích thước và định dạng.
+    The SurfacePool class keeps returned surfaces for reuse, bucketed by size and format.
+    Chỉ các bề mặt được cấp từ pool mới được nhận lại.
+    Only surfaces handed out by the pool are taken back.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        """
+        Khởi tạo pool.
+        Initialize the pool.
+        Parameters:
+            max_bytes (int): Dung lượng tối đa của các bề mặt đang chờ dùng lại.
+        """
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.releases = 0
+        self.discarded = 0
+        self.trimmed = 0
+        self._buckets = {}
+        self._issued = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def acquire(self, size, flags=0):
+        """
+        Lấy một bề mặt từ pool, hoặc tạo mới nếu không có bề mặt phù hợp.
+        Get a surface from the pool, or create a new one if none fits.
+        Bề mặt SRCALPHA dùng lại được xóa về trong suốt; các bề mặt khác giữ nội dung cũ.
+        Reused SRCALPHA surfaces are cleared to transparent; other surfaces keep their old content.
+        Parameters:
+            size (tuple): Kích thước (width, height).
+            flags (int): Cờ của bề mặt (chỉ pygame.SRCALPHA được phân biệt).
+        Returns:
+            pygame.Surface: Bề mặt.
+        """
+        key = (int(size[0]), int(size[1]), flags & pygame.SRCALPHA)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            surface = bucket.pop() if bucket else None
+            if surface is not None:
+                self.hits += 1
+                self.bytes -= surface_bytes(surface)
+            else:
+                self.misses += 1
+
+        if surface is None:
+            surface = pygame.Surface(key[:2], key[2])
+        elif key[2]:
+            surface.fill((0, 0, 0, 0))
+        with self._lock:
+            self._issued[surface] = key
+        return surface
+
+    def release(self, surface):
+        """
+        Trả bề mặt về pool. Bề mặt không được cấp từ pool sẽ bị bỏ qua.
+        Return a surface to the pool. Surfaces not handed out by the pool are ignored.
+        Parameters:
+            surface (pygame.Surface): Bề mặt cần trả lại.
+        Returns:
+            bool: True nếu bề mặt được giữ lại để dùng lại.
+        """
+        size = surface_bytes(surface)
+        with self._lock:
+            key = self._issued.pop(surface, None)
+            if key is None:
+                return False
+            if self.bytes + size > self.max_bytes:
+                self.discarded += 1
+                return False
+            surface.set_clip(None)
+            self._buckets.setdefault(key, []).append(surface)
+            self.bytes += size
+            self.releases += 1
+        return True
+
+    def trim(self, target_bytes=0):
+        """
+        Giải phóng các bề mặt đang chờ cho tới khi dung lượng không vượt quá target_bytes.
+        Free waiting surfaces until the pooled size is no more than target_bytes.
+        Bề mặt lớn nhất được giải phóng trước.
+        The largest surfaces are freed first.
+        Parameters:
+            target_bytes (int): Dung lượng mục tiêu.
+        Returns:
+            int: Số byte đã giải phóng.
+        """
+        freed = 0
+        with self._lock:
+            for key in sorted(self._buckets, key=lambda key: key[0] * key[1], reverse=True):
+                bucket = self._buckets[key]
+                while bucket and self.bytes > target_bytes:
+                    size = surface_bytes(bucket.pop())
+                    self.bytes -= size
+                    freed += size
+                    self.trimmed += 1
+                if not bucket:
+                    del self._buckets[key]
+                if self.bytes <= target_bytes:
+                    break
+        return freed
+
+    def stats(self):
+        """
+        Trả về thống kê của pool.
+        Return the pool statistics.
+        Returns:
+            dict: Số lần dùng lại (hits), tạo mới (misses), trả lại, bỏ đi, giải phóng và dung lượng đang giữ.
+        """
+        requests = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / requests if requests else 0.0,
+            'releases': self.releases,
+            'discarded': self.discarded,
+            'trimmed': self.trimmed,
+            'pooled_bytes': self.bytes,
+            'pooled_surfaces': sum(len(bucket) for bucket in self._buckets.values()),
+        }
+
+
+pool = SurfacePool()
+tracker.add_cache(pool)
@@ -0,0 +1,217 @@
+import gzip
+import hashlib
+import json
+import struct
+import time
+
+import pygame
+
+
+MAGIC = b'PYSREC1\n'
+
+# Mỗi bản ghi: số khung hình, thời điểm (ms), loại sự kiện, độ dài dữ liệu
+# Each record: frame number, timestamp (ms), event type, payload length
+RECORD = struct.Struct('<IIHH')
+
+# Loại bản ghi đánh dấu đầu một khung hình (SDL không dùng loại sự kiện 0)
+# Record type marking the start of a frame (SDL never uses event type 0)
+FRAME_MARKER = 0
+
+
+class EventRecorder:
+    """
+    Lớp EventRecorder ghi lại luồng sự kiện cùng thời điểm của từng khung hình vào tệp nhị phân nén.
+    The EventRecorder class captures the event stream with per-frame timestamps to a compressed binary log.
+    """
+
+    def __init__(self, filename):
+        """
+        Mở tệp ghi.
+        Open the log file.
+        Parameters:
+            filename (str): Đường dẫn tệp ghi.
+        """
+        self.file = gzip.open(filename, 'wb')
+        self.file.write(MAGIC)
+        self.frame = -1
+        self._start = time.perf_counter()
+
+    def _elapsed_ms(self):
+        return int((time.perf_counter() - self._start) * 1000)
+
+    def next_frame(self):
+        """
+        Đánh dấu bắt đầu một khung hình mới. Gọi một lần ở đầu mỗi vòng lặp chính.
+        Mark the start of a new frame. Call once at the top of every main loop iteration.
+        """
+        self.frame += 1
+        self.file.write(RECORD.pack(self.frame, self._elapsed_ms(), FRAME_MARKER, 0))
+
+    def record(self, event):
+        """
+        Ghi lại một sự kiện pygame vào khung hình hiện tại.
+        Record a pygame event in the current frame.
+        Parameters:
+            event (pygame.event.Event): Sự kiện cần ghi.
+        """
+        payload = json.dumps(_serializable(event.dict), separators=(',', ':')).encode('utf-8')
+        self.file.write(RECORD.pack(max(self.frame, 0), self._elapsed_ms(), event.type, len(payload)))
+        self.file.write(payload)
+
+    def close(self):
+        """
+        Đóng tệp ghi.
+        Close the log file.
+        """
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _serializable(attributes):
+    """
+    Giữ lại các thuộc tính của sự kiện có thể ghi dưới dạng JSON.
+    Keep the event attributes that can be written as JSON.
+    """
+    result = {}
+    for key, value in attributes.items():
+        if isinstance(value, (bool, int, float, str)) or value is None:
+            result[key] = value
+        elif isinstance(value, (tuple, list)) and all(isinstance(item, (int, float)) for item in value):
+            result[key] = list(value)
+    return result
+
+
+def read_frames(filename):
+    """
+    Đọc tệp ghi và trả về danh sách các khung hình.
+    Read a log file and return the list of frames.
+    Parameters:
+        filename (str): Đường dẫn tệp ghi.
+    Returns:
+        list: Mỗi phần tử là (thời điểm ms, danh sách pygame.event.Event).
+    """
+    frames = []
+    with gzip.open(filename, 'rb') as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"'{filename}' không phải tệp ghi sự kiện.")
+        while True:
+            header = file.read(RECORD.size)
+            if len(header) < RECORD.size:
+                break
+            frame, timestamp, event_type, length = RECORD.unpack(header)
+            if event_type == FRAME_MARKER:
+                frames.append((timestamp, []))
+                continue
+            attributes = json.loads(file.read(length).decode('utf-8'))
+            attributes = {key: tuple(value) if isinstance(value, list) else value
+                          for key, value in attributes.items()}
+            if not frames:
+                frames.append((timestamp, []))
+            frames[-1][1].append(pygame.event.Event(event_type, attributes))
+    return frames
+
+
+def frame_hash(surface):
+    """
+    Trả về mã băm nội dung điểm ảnh của bề mặt.
+    Return a hash of the pixel content of a surface.
+    """
+    to_bytes = getattr(pygame.image, 'tobytes', None) or pygame.image.tostring
+    return hashlib.blake2b(to_bytes(surface, 'RGB'), digest_size=16).hexdigest()
+
+
+class ReplayStats:
+    """
+    Lớp ReplayStats chứa thời gian vẽ từng khung hình và mã băm khung hình của một lần phát lại.
+    The ReplayStats class holds the per-frame render times and frame hashes of a replay run.
+    """
+
+    def __init__(self):
+        self.frame_times = []
+        self.frame_hashes = []
+        self.mismatched_frames = []
+
+    def summary(self):
+        """
+        Trả về thống kê thời gian khung hình (ms).
+        Return the frame time statistics (ms).
+        Returns:
+            dict: Số khung hình, trung bình, p50, p95, p99, lớn nhất và số khung hình khác với bản tham chiếu.
+        """
+        times = sorted(self.frame_times)
+        if not times:
+            return {'frames': 0}
+
+        def percentile(p):
+            return times[min(len(times) - 1, int(len(times) * p))] * 1000
+
+        return {
+            'frames': len(times),
+            'mean_ms': sum(times) / len(times) * 1000,
+            'p50_ms': percentile(0.50),
+            'p95_ms': percentile(0.95),
+            'p99_ms': percentile(0.99),
+            'max_ms': times[-1] * 1000,
+            'mismatched_frames': len(self.mismatched_frames),
+        }
+
+    def save_hashes(self, filename):
+        """
+        Lưu mã băm của các khung hình, mỗi dòng một mã.
+        Save the frame hashes, one per line.
+        """
+        with open(filename, 'w') as file:
+            file.write('\n'.join(self.frame_hashes))
+
+
+def replay(filename, screen, event_handler, frame_handler=None, real_time=False, hash_frames=False,
+           reference=None):
+    """
+    Phát lại tệp ghi sự kiện (không cần cửa sổ) và đo thời gian vẽ từng khung hình.
+    Replay an event log (headless) and measure the render time of every frame.
+    Parameters:
+        filename (str): Đường dẫn tệp ghi.
+        screen (Widget): Widget gốc được vẽ mỗi khung hình.
+        event_handler (callable): Hàm xử lý từng sự kiện (ví dụ event_scripts).
+        frame_handler (callable): Hàm gọi mỗi khung hình (ví dụ no_event_scripts).
+        real_time (bool): Phát lại theo đúng tốc độ đã ghi thay vì nhanh nhất có thể.
+        hash_frames (bool): Tính mã băm của từng khung hình đã vẽ.
+        reference (str): Tệp mã băm tham chiếu để so sánh từng khung hình.
+    Returns:
+        ReplayStats: Thống kê của lần phát lại.
+    """
+    stats = ReplayStats()
+    expected = None
+    if reference is not None:
+        with open(reference) as file:
+            expected = file.read().split()
+        hash_frames = True
+
+    start = time.perf_counter()
+    for index, (timestamp, events) in enumerate(read_frames(filename)):
+        if real_time:
+            delay = timestamp / 1000 - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+
+        frame_start = time.perf_counter()
+        for event in events:
+            if event.type == pygame.QUIT:
+                return stats
+            event_handler(event)
+        if frame_handler is not None:
+            frame_handler()
+        surface = screen.print()
+        stats.frame_times.append(time.perf_counter() - frame_start)
+
+        if hash_frames:
+            digest = frame_hash(surface)
+            stats.frame_hashes.append(digest)
+            if expected is not None and (index >= len(expected) or expected[index] != digest):
+                stats.mismatched_frames.append(index)
+    return stats
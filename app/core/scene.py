@@ -0,0 +1,140 @@
+import json
+import os
+
+import pygame
+
+from .widgets import *
+from .widgets import _cached_font
+from .layout import Row, Column, Grid
+
+try:
+    import tomllib
+except ImportError:
+    tomllib = None
+
+
+SCENE_DIRECTORY = os.path.join(os.path.dirname(__file__) + "/..", 'static', 'scenes')
+
+# Các loại widget có thể khai báo trong tệp scene
+# Widget types that can be declared in a scene file
+WIDGET_TYPES = {
+    cls.__name__: cls
+    for cls in (Container, Window, Image, Button, Text, Rectangle, RectangleText, Circle, CircleText, Textbox,
+                Checkbox, Form, Input, Row, Column, Grid)
+}
+
+# Các khóa của một nút không được truyền vào hàm khởi tạo widget
+# Node keys that are not passed to the widget constructor
+RESERVED_KEYS = ('type', 'id', 'location', 'visible', 'lazy', 'grow', 'children')
+
+_parsed_scenes = {}
+
+
+def register_widget_type(cls):
+    """
+    Đăng ký một lớp widget tùy chỉnh để dùng trong tệp scene.
+    Register a custom widget class to be used in scene files.
+    Parameters:
+        cls (type): Lớp widget cần đăng ký.
+    Returns:
+        type: Chính lớp đó (có thể dùng như decorator).
+    """
+    WIDGET_TYPES[cls.__name__] = cls
+    return cls
+
+
+def parse_scene(filename):
+    """
+    Đọc và phân tích tệp scene (JSON hoặc TOML). Kết quả được lưu đệm cho tới khi tệp thay đổi.
+    Read and parse a scene file (JSON or TOML). The result is cached until the file changes.
+    Parameters:
+        filename (str): Tên tệp scene (không bao gồm đường dẫn tới thư mục "scenes").
+    Returns:
+        dict: Nội dung của scene.
+    """
+    path = os.path.join(SCENE_DIRECTORY, filename)
+    mtime = os.path.getmtime(path)
+    cached = _parsed_scenes.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    if path.endswith('.toml'):
+        if tomllib is None:
+            raise ImportError("Cần Python 3.11+ (tomllib) để đọc tệp scene TOML.")
+        with open(path, 'rb') as file:
+            data = tomllib.load(file)
+    else:
+        with open(path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+
+    _parsed_scenes[path] = (mtime, data)
+    return data
+
+
+def load_scene(filename, root=None):
+    """
+    Tạo cây widget từ tệp scene. Các cây con bị ẩn hoặc đánh dấu "lazy" chỉ được tạo khi hiển thị lần đầu.
+    Build the widget tree from a scene file. Hidden subtrees or those marked "lazy" are only built on first display.
+    Parameters:
+        filename (str): Tên tệp scene (không bao gồm đường dẫn tới thư mục "scenes").
+        root (Widget): Widget nhận các đối tượng con của scene (mặc định là Screen).
+    Returns:
+        Widget: Widget gốc chứa scene.
+    """
+    data = parse_scene(filename)
+    if root is None:
+        root = Screen(**data.get('screen', {}))
+    _add_children(data.get('children', ()), root)
+    return root
+
+
+def build_widget(node):
+    """
+    Tạo một widget (và các đối tượng con của nó) từ một nút của scene.
+    Create a widget (and its children) from a scene node.
+    Parameters:
+        node (dict): Nút mô tả widget.
+    Returns:
+        Widget: Widget vừa được tạo.
+    """
+    widget_type = node['type']
+    if widget_type not in WIDGET_TYPES:
+        raise ValueError(f"Loại widget '{widget_type}' không tồn tại.")
+
+    kwargs = {key: _convert(key, value) for key, value in node.items() if key not in RESERVED_KEYS}
+    widget = WIDGET_TYPES[widget_type](id=node.get('id'), **kwargs)
+    widget.visible = node.get('visible', True)
+
+    children = node.get('children')
+    if children:
+        if not widget.visible or node.get('lazy', False):
+            widget.defer_children(lambda parent: _add_children(children, parent))
+        else:
+            _add_children(children, widget)
+    return widget
+
+
+def _add_children(nodes, parent):
+    """
+    Thêm các nút con của scene vào widget cha.
+    Add the scene child nodes to the parent widget.
+    """
+    for node in nodes:
+        location = tuple(node.get('location', (0, 0)))
+        if 'grow' in node:
+            parent.add_child(location, build_widget(node), grow=node['grow'])
+        else:
+            parent.add_child(location, build_widget(node))
+
+
+def _convert(key, value):
+    """
+    Chuyển giá trị trong tệp scene sang đối tượng pygame tương ứng (màu, font).
+    Convert a scene file value to the matching pygame object (color, font).
+    """
+    if key.endswith('color') and value is not None:
+        return pygame.Color(*value) if isinstance(value, (list, tuple)) else pygame.Color(value)
+    if key.endswith('font') and isinstance(value, (list, tuple)):
+        # [tên, cỡ chữ] hoặc [cỡ chữ] cho font mặc định
+        return _cached_font(*value) if len(value) == 2 else _cached_font(None, *value)
+    return value
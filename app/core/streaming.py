@@ -0,0 +1,513 @@
+import json
+import socket
+import struct
+import threading
+import time
+import zlib
+
+import numpy as np
+import pygame
+
+from .replay import _serializable
+
+
+DEFAULT_PORT = 5901
+
+# Mỗi khung hình: magic, loại, số thứ tự, thời điểm xuất bản, kích thước, cạnh ô, số ô, độ dài dữ liệu nén
+# Each frame: magic, kind, sequence number, publish time, size, tile edge, tile count, compressed payload length
+FRAME_HEADER = struct.Struct('<4sBIdHHHII')
+FRAME_MAGIC = b'PYSF'
+KEYFRAME = 0
+DELTA = 1
+
+# Mỗi tin nhắn từ client: loại sự kiện, độ dài dữ liệu JSON
+# Each client message: event type, JSON payload length
+EVENT_HEADER = struct.Struct('<HH')
+
+# Loại tin nhắn yêu cầu khung hình đầy đủ (SDL không dùng loại sự kiện 0)
+# Message type requesting a full frame (SDL never uses event type 0)
+REQUEST_KEYFRAME = 0
+
+# Chỉ các sự kiện chuột và bàn phím từ xa được đưa vào hàng đợi sự kiện
+# Only remote mouse and keyboard events are posted to the event queue
+INPUT_EVENTS = (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEWHEEL,
+                pygame.KEYDOWN, pygame.KEYUP, pygame.TEXTINPUT)
+
+
+def parse_address(address, default_host='127.0.0.1'):
+    """
+    Phân tích địa chỉ dạng "host:port" hoặc "port".
+    Parse an address of the form "host:port" or "port".
+    Returns:
+        tuple: (host, port).
+    """
+    host, _, port = str(address).rpartition(':')
+    return host or default_host, int(port)
+
+
+def _recv_exact(sock, size):
+    """
+    Đọc đúng size byte từ socket. Trả về None nếu kết nối đã đóng.
+    Read exactly size bytes from the socket. Return None if the connection was closed.
+    """
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def _tile_slices(width, height, tile, index):
+    columns = (width + tile - 1) // tile
+    row, column = divmod(int(index), columns)
+    return slice(row * tile, (row + 1) * tile), slice(column * tile, (column + 1) * tile)
+
+
+class FrameStreamer:
+    """
+    Lớp FrameStreamer phát các khung hình của Screen tới các client qua TCP và nhận lại sự kiện chuột, bàn phím.
+    The FrameStreamer class streams the Screen frames to clients over TCP and takes mouse and keyboard events back.
+    Vòng lặp chính chỉ sao chép khung hình mới nhất; mỗi client có luồng riêng để tìm các ô thay đổi, mã hóa XOR
+    với khung hình đã gửi trước đó và nén. Client chậm bỏ qua các khung hình trung gian thay vì làm chậm vòng lặp chính.
+    The main loop only copies the latest frame; every client has its own thread that finds the changed tiles,
+    XOR-encodes them against the previously sent frame and compresses them. Slow clients skip intermediate frames
+    instead of stalling the main loop.
+    """
+
+    def __init__(self, host='127.0.0.1', port=DEFAULT_PORT, max_fps=30, tile=32, keyframe_interval=5.0,
+                 compression=1, allow_input=True):
+        """
+        Khởi tạo server.
+        Initialize the server.
+        Parameters:
+            host (str): Địa chỉ lắng nghe (mặc định chỉ máy cục bộ).
+            port (int): Cổng lắng nghe.
+            max_fps (int): Số khung hình tối đa được xuất bản mỗi giây.
+            tile (int): Cạnh của ô dùng để tìm vùng thay đổi.
+            keyframe_interval (float): Số giây giữa hai khung hình đầy đủ.
+            compression (int): Mức nén zlib (1-9).
+            allow_input (bool): Đưa sự kiện từ client vào hàng đợi sự kiện.
+        """
+        self.host = host
+        self.port = port
+        self.max_fps = max_fps
+        self.tile = tile
+        self.keyframe_interval = keyframe_interval
+        self.compression = compression
+        self.allow_input = allow_input
+        self.published = 0
+        self._frame = None
+        self._last_publish = 0.0
+        self._sessions = []
+        # Bộ đếm của các phiên đã đóng (mỗi phiên tự giữ bộ đếm của mình khi còn kết nối)
+        # Counters of the closed sessions (each session keeps its own counters while connected)
+        self._closed_totals = dict.fromkeys(_StreamSession.TOTALS, 0)
+        self._condition = threading.Condition()
+        self._server = None
+        self._running = False
+
+    def start(self):
+        """
+        Bắt đầu lắng nghe kết nối trong một luồng nền.
+        Start listening for connections on a background thread.
+        Returns:
+            FrameStreamer: Chính server (để viết gọn).
+        """
+        self._server = socket.create_server((self.host, self.port))
+        self.port = self._server.getsockname()[1]
+        self._running = True
+        threading.Thread(target=self._accept_loop, name='stream-accept', daemon=True).start()
+        return self
+
+    def stop(self):
+        """
+        Dừng server và đóng mọi kết nối.
+        Stop the server and close every connection.
+        """
+        self._running = False
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        with self._condition:
+            sessions, self._sessions = self._sessions, []
+            self._condition.notify_all()
+        for session in sessions:
+            session.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @property
+    def clients(self):
+        return len(self._sessions)
+
+    def publish(self, surface):
+        """
+        Xuất bản khung hình hiện tại. Gọi sau screen.print() trong vòng lặp chính; không bao giờ bị chặn bởi client.
+        Publish the current frame. Call after screen.print() in the main loop; it is never blocked by clients.
+        Parameters:
+            surface (pygame.Surface): Bề mặt của Screen.
+        Returns:
+            bool: True nếu khung hình đã được xuất bản.
+        """
+        if not self._sessions:
+            return False
+        now = time.perf_counter()
+        if now - self._last_publish < 1 / self.max_fps:
+            return False
+        self._last_publish = now
+        # Sao chép điểm ảnh vì bề mặt sẽ được vẽ lại ở khung hình tiếp theo
+        data = pygame.image.tobytes(surface, 'RGB')
+        with self._condition:
+            self.published += 1
+            self._frame = (self.published, time.time(), surface.get_size(), data)
+            self._condition.notify_all()
+        return True
+
+    def _wait_frame(self, last_sequence, timeout=1.0):
+        """
+        Chờ khung hình mới hơn last_sequence. Luôn trả về khung hình mới nhất.
+        Wait for a frame newer than last_sequence. Always returns the latest frame.
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: not self._running or (self._frame is not None and self._frame[0] > last_sequence), timeout)
+            frame = self._frame
+        if not self._running or frame is None or frame[0] <= last_sequence:
+            return None
+        return frame
+
+    def _accept_loop(self):
+        while self._running:
+            try:
+                connection, _ = self._server.accept()
+            except OSError:
+                break
+            session = _StreamSession(self, connection)
+            with self._condition:
+                self._sessions.append(session)
+            session.start()
+
+    def _remove(self, session):
+        with self._condition:
+            if session in self._sessions:
+                self._sessions.remove(session)
+                for name in _StreamSession.TOTALS:
+                    self._closed_totals[name] += getattr(session, name)
+
+    def stats(self):
+        """
+        Trả về thống kê của server.
+        Return the server statistics.
+        Returns:
+            dict: Số client, số khung hình đã xuất bản, tổng số khung hình đã gửi, số byte đã gửi và số sự kiện
+                đã nhận (kể cả các client đã ngắt kết nối), và thống kê riêng của từng client đang kết nối
+                ('sessions'), trong đó có số khung hình client đó đã bỏ qua.
+                The number of clients, frames published, total frames sent, bytes sent and events received
+                (including disconnected clients), and the statistics of each connected client ('sessions'),
+                including the frames that client skipped.
+        """
+        with self._condition:
+            sessions = [session.stats() for session in self._sessions]
+            totals = dict(self._closed_totals)
+        for session in sessions:
+            for name in _StreamSession.TOTALS:
+                totals[name] += session[name]
+        return {
+            'clients': len(sessions),
+            'published': self.published,
+            'frames_sent': totals['frames_sent'],
+            'bytes_sent': totals['bytes_sent'],
+            'events_received': totals['events_received'],
+            'sessions': sessions,
+        }
+
+
+class _StreamSession:
+    """
+    Một kết nối client: một luồng gửi khung hình và một luồng nhận sự kiện.
+    One client connection: a thread sending frames and a thread receiving events.
+    """
+
+    # Client không nhận dữ liệu trong thời gian này bị ngắt kết nối
+    # Clients that do not accept data for this long are disconnected
+    SEND_TIMEOUT = 10.0
+
+    # Các bộ đếm của phiên; mỗi bộ đếm chỉ được ghi bởi một luồng của phiên nên không cần khóa
+    # The session counters; each is only written by one thread of the session so no lock is needed
+    COUNTERS = ('frames_sent', 'frames_dropped', 'bytes_sent', 'events_received')
+    # Các bộ đếm được cộng dồn cho cả server (số khung hình bỏ qua chỉ có nghĩa với từng client)
+    # The counters summed for the whole server (skipped frames are only meaningful per client)
+    TOTALS = ('frames_sent', 'bytes_sent', 'events_received')
+
+    def __init__(self, streamer, connection):
+        self.streamer = streamer
+        self.connection = connection
+        self.connection.settimeout(self.SEND_TIMEOUT)
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.keyframe_requested = True
+        self.closed = False
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self.bytes_sent = 0
+        self.events_received = 0
+
+    def stats(self):
+        """
+        Trả về các bộ đếm của phiên.
+        Return the counters of the session.
+        """
+        return {name: getattr(self, name) for name in self.COUNTERS}
+
+    def start(self):
+        threading.Thread(target=self._send_loop, name='stream-send', daemon=True).start()
+        threading.Thread(target=self._receive_loop, name='stream-receive', daemon=True).start()
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            try:
+                self.connection.close()
+            except OSError:
+                pass
+        self.streamer._remove(self)
+
+    def _send_loop(self):
+        streamer = self.streamer
+        tile = streamer.tile
+        previous = None
+        last_sequence = 0
+        next_keyframe = 0.0
+        try:
+            while not self.closed:
+                frame = streamer._wait_frame(last_sequence)
+                if frame is None:
+                    continue
+                sequence, timestamp, (width, height), data = frame
+                if last_sequence:
+                    self.frames_dropped += sequence - last_sequence - 1
+                last_sequence = sequence
+                pixels = np.frombuffer(data, dtype=np.uint8).reshape(height, width, 3)
+
+                now = time.perf_counter()
+                if (self.keyframe_requested or previous is None or previous.shape != pixels.shape
+                        or now >= next_keyframe):
+                    self.keyframe_requested = False
+                    next_keyframe = now + streamer.keyframe_interval
+                    kind, tiles, payload = KEYFRAME, np.empty(0, dtype=np.uint32), data
+                    previous = pixels
+                else:
+                    # Phần không thay đổi của XOR bằng 0 nên nén rất tốt
+                    delta = np.bitwise_xor(pixels, previous)
+                    changed = delta.any(axis=2)
+                    changed = np.logical_or.reduceat(changed, np.arange(0, height, tile), axis=0)
+                    changed = np.logical_or.reduceat(changed, np.arange(0, width, tile), axis=1)
+                    tiles = np.flatnonzero(changed).astype(np.uint32)
+                    previous = pixels
+                    if not len(tiles):
+                        continue
+                    kind = DELTA
+                    payload = b''.join(delta[_tile_slices(width, height, tile, index)].tobytes() for index in tiles)
+
+                payload = zlib.compress(payload, streamer.compression)
+                header = FRAME_HEADER.pack(FRAME_MAGIC, kind, sequence, timestamp, width, height, tile, len(tiles),
+                                           len(payload))
+                message = header + tiles.tobytes() + payload
+                self.connection.sendall(message)
+                self.frames_sent += 1
+                self.bytes_sent += len(message)
+        except OSError:
+            pass
+        finally:
+            self.close()
+
+    def _receive_loop(self):
+        streamer = self.streamer
+        try:
+            while not self.closed:
+                try:
+                    header = _recv_exact(self.connection, EVENT_HEADER.size)
+                except socket.timeout:
+                    continue
+                if header is None:
+                    break
+                event_type, length = EVENT_HEADER.unpack(header)
+                payload = _recv_exact(self.connection, length) if length else b''
+                if payload is None:
+                    break
+                if event_type == REQUEST_KEYFRAME:
+                    self.keyframe_requested = True
+                elif streamer.allow_input and event_type in INPUT_EVENTS:
+                    attributes = json.loads(payload.decode('utf-8'))
+                    attributes = {key: tuple(value) if isinstance(value, list) else value
+                                  for key, value in attributes.items()}
+                    attributes['remote'] = True
+                    pygame.event.post(pygame.event.Event(event_type, attributes))
+                    self.events_received += 1
+        except (OSError, ValueError):
+            pass
+        finally:
+            self.close()
+
+
+class StreamClient:
+    """
+    Lớp StreamClient kết nối tới FrameStreamer, giải mã khung hình và đo băng thông, độ trễ.
+    The StreamClient class connects to a FrameStreamer, decodes the frames and measures bandwidth and latency.
+    """
+
+    def __init__(self, host='127.0.0.1', port=DEFAULT_PORT):
+        """
+        Kết nối tới server.
+        Connect to the server.
+        Parameters:
+            host (str): Địa chỉ server.
+            port (int): Cổng server.
+        """
+        self.socket = socket.create_connection((host, port))
+        self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.frame = None
+        self.frames = 0
+        self.keyframes = 0
+        self.bytes_received = 0
+        self.tiles_received = 0
+        self.latencies = []
+        self._send_lock = threading.Lock()
+
+    def receive(self):
+        """
+        Nhận và giải mã một khung hình.
+        Receive and decode one frame.
+        Returns:
+            numpy.ndarray: Khung hình (height, width, 3), hoặc None nếu kết nối đã đóng.
+        """
+        header = _recv_exact(self.socket, FRAME_HEADER.size)
+        if header is None:
+            return None
+        magic, kind, sequence, timestamp, width, height, tile, tile_count, length = FRAME_HEADER.unpack(header)
+        if magic != FRAME_MAGIC:
+            raise ValueError("Dữ liệu không phải khung hình.")
+        tiles = np.frombuffer(_recv_exact(self.socket, tile_count * 4) or b'', dtype=np.uint32)
+        data = zlib.decompress(_recv_exact(self.socket, length))
+
+        if kind == KEYFRAME:
+            self.frame = np.frombuffer(data, dtype=np.uint8).reshape(height, width, 3).copy()
+            self.keyframes += 1
+        elif self.frame is None or self.frame.shape != (height, width, 3):
+            # Khung hình XOR không dùng được khi chưa có khung hình gốc
+            self.request_keyframe()
+            return self.receive()
+        else:
+            offset = 0
+            for index in tiles:
+                view = self.frame[_tile_slices(width, height, tile, index)]
+                block = np.frombuffer(data, dtype=np.uint8, count=view.size, offset=offset)
+                view ^= block.reshape(view.shape)
+                offset += view.size
+
+        self.frames += 1
+        self.tiles_received += tile_count
+        self.bytes_received += FRAME_HEADER.size + tile_count * 4 + length
+        self.latencies.append(time.time() - timestamp)
+        return self.frame
+
+    def _send(self, event_type, payload=b''):
+        with self._send_lock:
+            self.socket.sendall(EVENT_HEADER.pack(event_type, len(payload)) + payload)
+
+    def request_keyframe(self):
+        """
+        Yêu cầu server gửi khung hình đầy đủ.
+        Ask the server for a full frame.
+        """
+        self._send(REQUEST_KEYFRAME)
+
+    def send_event(self, event):
+        """
+        Gửi một sự kiện chuột hoặc bàn phím tới server.
+        Send a mouse or keyboard event to the server.
+        Parameters:
+            event (pygame.event.Event): Sự kiện cần gửi.
+        """
+        if event.type in INPUT_EVENTS:
+            self._send(event.type, json.dumps(_serializable(event.dict), separators=(',', ':')).encode('utf-8'))
+
+    def close(self):
+        self.socket.close()
+
+    def summary(self, elapsed):
+        """
+        Trả về thống kê băng thông và độ trễ.
+        Return the bandwidth and latency statistics.
+        Parameters:
+            elapsed (float): Thời gian đo (giây).
+        Returns:
+            dict: Số khung hình, khung hình/giây, KB/giây, số byte trung bình mỗi khung hình, độ trễ p50, p95 (ms).
+        """
+        latencies = sorted(self.latencies)
+
+        def percentile(p):
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0.0
+
+        return {
+            'frames': self.frames,
+            'keyframes': self.keyframes,
+            'fps': self.frames / elapsed if elapsed else 0.0,
+            'kb_per_s': self.bytes_received / 1024 / elapsed if elapsed else 0.0,
+            'bytes_per_frame': self.bytes_received / self.frames if self.frames else 0.0,
+            'latency_p50_ms': percentile(0.50),
+            'latency_p95_ms': percentile(0.95),
+        }
+
+
+def run_client(address, seconds=None, view=True):
+    """
+    Chạy client thử nghiệm: hiển thị luồng khung hình (nếu view), chuyển tiếp sự kiện chuột và bàn phím,
+    và trả về thống kê băng thông, độ trễ.
+    Run the test client: show the frame stream (if view), forward mouse and keyboard events,
+    and return the bandwidth and latency statistics.
+    Parameters:
+        address (str): Địa chỉ server dạng "host:port" hoặc "port".
+        seconds (float): Thời gian chạy tối đa (mặc định tới khi đóng cửa sổ hoặc server ngắt kết nối).
+        view (bool): Mở cửa sổ hiển thị khung hình.
+    Returns:
+        dict: Thống kê (xem StreamClient.summary()).
+    Raises:
+        ConnectionError: Không kết nối được tới server.
+    """
+    try:
+        client = StreamClient(*parse_address(address))
+    except OSError as error:
+        raise ConnectionError(f"Không kết nối được tới '{address}' / cannot connect to '{address}': "
+                              f"{error.strerror or error}") from None
+    display = None
+    start = time.perf_counter()
+    try:
+        while seconds is None or time.perf_counter() - start < seconds:
+            frame = client.receive()
+            if frame is None:
+                break
+            if not view:
+                continue
+
+            height, width = frame.shape[:2]
+            if display is None or display.get_size() != (width, height):
+                display = pygame.display.set_mode((width, height))
+                pygame.display.set_caption("PyScript Stream")
+            display.blit(pygame.image.frombuffer(frame.tobytes(), (width, height), 'RGB'), (0, 0))
+            pygame.display.flip()
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return client.summary(time.perf_counter() - start)
+                client.send_event(event)
+    except OSError:
+        pass
+    finally:
+        client.close()
+    return client.summary(time.perf_counter() - start)
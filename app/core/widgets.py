@@ -1,6 +1,40 @@
 import pygame
 import os
+import threading
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+from .assets import active_bundle
+from .memory import surface_bytes, tracker
+from .pool import pool
+
+
+# pygame.font không an toàn khi nhiều luồng dùng chung một font (xem Screen.set_workers)
+# pygame.font is not safe when several threads share one font (see Screen.set_workers)
+_font_lock = threading.RLock()
+_fonts = {}
+
+
+def _render_text(font, text, color):
+    """
+    Vẽ văn bản (khử răng cưa) bằng font, an toàn khi gọi từ nhiều luồng.
+    Render antialiased text with the font, safe to call from several threads.
+    """
+    with _font_lock:
+        return font.render(text, True, color)
+
+
+def _cached_font(name, size):
+    """
+    Trả về font dùng chung theo tên tệp font (None là font mặc định) và cỡ chữ, an toàn khi gọi từ nhiều luồng.
+    Return the shared font for a font file name (None for the default font) and size, safe to call from several
+    threads.
+    """
+    key = (name, size)
+    with _font_lock:
+        if key not in _fonts:
+            _fonts[key] = pygame.font.Font(name, size)
+        return _fonts[key]
 
 
 class Audio:
@@ -20,7 +54,11 @@ class Audio:
             sound_filename (str): Tên tệp âm thanh (không bao gồm đường dẫn).
         """
         sound_path = os.path.join(Audio.SOUND_DIRECTORY, sound_filename)
-        pygame.mixer.Sound(sound_path).play()
+        bundle = active_bundle()
+        sound = bundle.sound(sound_filename, sound_path) if bundle else None
+        if sound is None:
+            sound = pygame.mixer.Sound(sound_path)
+        sound.play()
 
     @staticmethod
     def play_music(music_filename, loop=-1):
@@ -50,22 +88,84 @@ class Widget(ABC):
     This Abstract Base Class represents a widget in the user interface.
     """
 
+    __slots__ = ('children', 'SURFACE', 'id', 'visible', 'static', '_allocated', '_last_drawn', '_deferred', '_cached',
+                 '_dirty', '_scaled', '_parent', '_borrowed', '_lent', '__weakref__')
+
     _used_ids = set()
+    _ids_lock = threading.Lock()
+
+    # Các thuộc tính bề mặt có thể tạo lại khi cần
+    # Surface attributes that can be regenerated on demand
+    _SURFACE_ATTRS = ('SURFACE',)
+
+    # Các bề mặt vẽ sẵn không thay đổi mà bản sao (clone) có thể dùng chung với widget gốc
+    # Immutable prerendered surfaces that clones may share with the original widget
+    _SHARED_ATTRS = ()
+
+    # Các thuộc tính công khai không ảnh hưởng tới nội dung đã vẽ (xem __setattr__)
+    # Public attributes that do not affect the rendered content (see __setattr__)
+    _UNTRACKED_ATTRS = frozenset(('SURFACE', 'id'))
+
+    # Số khung hình bị ẩn liên tiếp trước khi giải phóng bề mặt
+    # Number of consecutive hidden frames before the surfaces are released
+    RELEASE_AFTER_FRAMES = 120
 
     def __init__(self, id=None):
         """
         Khởi tạo một widget mới.
         Initializes a new widget.
         """
-        self.children = []
-        self.SURFACE = None
-        if id is None:
-            self.id = self._generate_unique_id()
-        else:
-            if id in Widget._used_ids:
-                raise ValueError(f"ID '{id}' đã được sử dụng.")
-            self.id = id
-            Widget._used_ids.add(id)
+        # Gán trực tiếp, không qua __setattr__: widget mới chưa có gì để làm mất hiệu lực
+        set_slot = object.__setattr__
+        set_slot(self, '_cached', None)
+        # Widget chưa được vẽ: chưa có widget cha nào chứa nội dung của nó
+        set_slot(self, '_dirty', True)
+        set_slot(self, '_scaled', None)
+        set_slot(self, '_parent', None)
+        set_slot(self, '_allocated', False)
+        set_slot(self, '_last_drawn', -1)
+        set_slot(self, '_deferred', None)
+        set_slot(self, '_borrowed', ())
+        set_slot(self, '_lent', ())
+        set_slot(self, 'children', ())
+        set_slot(self, 'SURFACE', None)
+        set_slot(self, 'visible', True)
+        set_slot(self, 'static', True)
+        self._register_id(id)
+
+    def __setattr__(self, name, value):
+        """
+        Gán thuộc tính. Gán trực tiếp một thuộc tính công khai (ví dụ widget.background_color = ...) làm bề mặt
+        tổng hợp đã lưu đệm của widget và các widget cha hết hiệu lực.
+        Set an attribute. Directly assigning a public attribute (e.g. widget.background_color = ...) invalidates
+        the cached composite of the widget and its ancestors.
+        """
+        object.__setattr__(self, name, value)
+        if name[0] == '_' or name in self._UNTRACKED_ATTRS or name in self._SURFACE_ATTRS:
+            return
+        if name == 'visible':
+            # Ẩn hay hiện chỉ thay đổi nội dung của widget cha
+            if value:
+                tracker.show(self)
+            else:
+                tracker.hide(self, self.RELEASE_AFTER_FRAMES)
+            self._invalidate_parents()
+        elif not self._dirty or self._scaled is not None:
+            self.invalidate()
+
+    def _register_id(self, id):
+        """
+        Gán ID cho widget, tự tạo ID nếu id là None.
+        Assign the ID of the widget, generating one if id is None.
+        """
+        with Widget._ids_lock:
+            if id is None:
+                self.id = self._generate_unique_id()
+            else:
+                if id in Widget._used_ids:
+                    raise ValueError(f"ID '{id}' đã được sử dụng.")
+                self.id = id
+                Widget._used_ids.add(id)
 
     @staticmethod
     def _generate_unique_id():
@@ -89,6 +189,267 @@ class Widget(ABC):
         """
         pass
 
+    def _allocate_surfaces(self):
+        """
+        Tạo các bề mặt của widget. Được gọi ở lần vẽ đầu tiên thay vì trong __init__.
+        Create the surfaces of the widget. Called on first render instead of in __init__.
+        """
+        pass
+
+    def _ensure_surfaces(self):
+        """
+        Đảm bảo các bề mặt của widget đã được tạo.
+        Make sure the surfaces of the widget are allocated.
+        """
+        if not self._allocated:
+            self._allocated = True
+            self._allocate_surfaces()
+            tracker.update(self)
+
+    def _release_own_surfaces(self):
+        """
+        Giải phóng bề mặt của riêng widget, không bao gồm các đối tượng con.
+        Release the surfaces of the widget itself, not including its children.
+        """
+        for attr in self._SURFACE_ATTRS:
+            surface = getattr(self, attr)
+            if surface is not None:
+                # Bề mặt dùng chung với widget gốc hoặc bản sao không được trả về pool
+                if attr not in self._lent and attr not in self._borrowed:
+                    pool.release(surface)
+                setattr(self, attr, None)
+        self._allocated = False
+        self._cached = None
+        self._scaled = None
+        self._borrowed = ()
+        self._lent = ()
+        tracker.forget(self)
+
+    def surface_bytes(self):
+        """
+        Trả về tổng số byte của các bề mặt mà widget đang giữ.
+        Return the total number of bytes of the surfaces held by the widget.
+        """
+        # Bề mặt mượn từ widget gốc được tính cho widget gốc
+        surfaces = {id(surface): surface for surface in (getattr(self, attr) for attr in self._SURFACE_ATTRS
+                                                         if attr not in self._borrowed)
+                    if surface is not None}
+        if self._scaled is not None:
+            surfaces[id(self._scaled[1])] = self._scaled[1]
+        return sum(surface_bytes(surface) for surface in surfaces.values())
+
+    def clone(self, id=None):
+        """
+        Tạo bản sao của widget và toàn bộ cây con. Bản sao dùng chung các bề mặt vẽ sẵn không thay đổi
+        (_SHARED_ATTRS) với widget gốc; mỗi bên chỉ tạo bề mặt riêng khi bị thay đổi (xem update()).
+        Create a copy of the widget and its whole subtree. The clone shares the immutable prerendered surfaces
+        (_SHARED_ATTRS) with the original; either side only gets its own surfaces once it is changed (see update()).
+        Parameters:
+            id (str): ID của bản sao. Các đối tượng con luôn nhận ID mới.
+        Returns:
+            Widget: Bản sao.
+        """
+        if self._SHARED_ATTRS:
+            self._ensure_surfaces()
+        if self._deferred is not None:
+            # Tạo các đối tượng con đang trì hoãn trên widget gốc để bản sao nhận các đối tượng con với ID mới
+            factory, self._deferred = self._deferred, None
+            factory(self)
+        widget = object.__new__(type(self))
+        for cls in type(self).__mro__:
+            for slot in cls.__dict__.get('__slots__', ()):
+                if slot != '__weakref__' and hasattr(self, slot):
+                    object.__setattr__(widget, slot, getattr(self, slot))
+        widget._parent = None
+        widget._last_drawn = -1
+        widget._cached = None
+        widget._dirty = True
+        widget._scaled = None
+        widget._lent = ()
+        widget._register_id(id)
+
+        shared = tuple(attr for attr in self._SHARED_ATTRS if getattr(self, attr) is not None)
+        for attr in self._SURFACE_ATTRS:
+            if attr not in shared:
+                setattr(widget, attr, None)
+        # Các bề mặt còn thiếu (ví dụ bề mặt tổng hợp) được tạo ở lần vẽ đầu tiên của bản sao
+        widget._allocated = len(shared) == len(self._SURFACE_ATTRS)
+        widget._borrowed = shared
+        self._lent = tuple(set(self._lent).union(shared))
+
+        # Bản sao luôn có danh sách con riêng
+        children = [(location, child.clone()) for location, child in self.children] \
+            if isinstance(self.children, list) else ()
+        for _, child in children:
+            child._parent = widget
+        widget.children = children
+        return widget
+
+    def update(self, **attributes):
+        """
+        Thay đổi các thuộc tính của widget. Nếu có thay đổi, bề mặt của widget được vẽ lại ở lần vẽ tiếp theo;
+        bản sao thôi dùng chung bề mặt với widget gốc.
+        Change attributes of the widget. If anything changed, the surfaces of the widget are redrawn on the next
+        render; a clone stops sharing surfaces with its original.
+        Parameters:
+            **attributes: Tên và giá trị mới của các thuộc tính.
+        Returns:
+            bool: True nếu có thuộc tính thay đổi.
+        """
+        changed = False
+        for name, value in attributes.items():
+            if getattr(self, name, None) != value:
+                setattr(self, name, value)
+                changed = True
+        if changed:
+            self._release_own_surfaces()
+            self.invalidate()
+        return changed
+
+    def render(self):
+        """
+        Trả về bề mặt đã vẽ của widget. Kết quả lần vẽ trước được dùng lại cho tới khi widget hoặc một widget
+        trong cây con thay đổi (gán thuộc tính, invalidate(), update(), resize(), add_child(), vị trí hoặc trạng thái
+        hiển thị); thay đổi được lan lên các widget cha nên việc kiểm tra chỉ tốn O(1).
+        Widget có static = False (và các widget cha của nó) được vẽ lại mỗi lần.
+        Return the rendered surface of the widget. The previous result is reused until the widget or a widget
+        in its subtree changes (attribute assignment, invalidate(), update(), resize(), add_child(), location or
+        visibility); changes are propagated up to the ancestors so the check costs O(1).
+        Widgets with static = False (and their ancestors) are redrawn every time.
+        Returns:
+            pygame.Surface: Bề mặt hiển thị của widget.
+        """
+        if self._cached is not None:
+            return self._cached
+        surface = self.print()
+        # Thay đổi sau thời điểm này phải được báo lại cho các widget cha
+        self._dirty = False
+        if self.static and self._subtree_cached():
+            self._cached = surface
+        return surface
+
+    def _subtree_cached(self):
+        """
+        Kiểm tra các đối tượng con đang hiển thị và các widget được vẽ trực tiếp đều đã lưu đệm kết quả vẽ.
+        Check that the visible children and the directly drawn widgets all cached their rendered result.
+        """
+        if self._deferred is not None:
+            return False
+        for _, child in self.children:
+            if child.visible and child._cached is None:
+                return False
+        for part in self._parts():
+            if part._cached is None:
+                return False
+        return True
+
+    def invalidate(self):
+        """
+        Đánh dấu nội dung của widget đã thay đổi. Widget và các widget cha của nó được vẽ lại ở khung hình tiếp theo.
+        Mark the content of the widget as changed. The widget and its ancestors are redrawn on the next frame.
+        """
+        self._cached = None
+        if self._scaled is not None:
+            self._scaled = None
+            tracker.update(self)
+        # Widget đã bị đánh dấu từ lần vẽ trước thì các widget cha cũng đã được báo
+        if not self._dirty:
+            self._dirty = True
+            self._invalidate_parents()
+
+    def _invalidate_parents(self):
+        """
+        Đánh dấu bề mặt tổng hợp của các widget cha đã cũ (ví dụ khi vị trí hoặc trạng thái hiển thị thay đổi).
+        Mark the composites of the ancestors as stale (e.g. when the location or visibility changes).
+        """
+        parent = self._parent
+        if parent is None:
+            return
+        if type(parent) is tuple:
+            for widget in parent:
+                widget.invalidate()
+        else:
+            parent.invalidate()
+
+    def render_scaled(self, scale_x, scale_y):
+        """
+        Trả về bề mặt đã vẽ được co giãn theo tỷ lệ. Bản co giãn được lưu đệm cho tới khi nội dung thay đổi.
+        Return the rendered surface scaled by the given factors. The scaled copy is cached until the content changes.
+        Parameters:
+            scale_x (float): Tỷ lệ theo chiều ngang.
+            scale_y (float): Tỷ lệ theo chiều dọc.
+        Returns:
+            pygame.Surface: Bề mặt đã co giãn.
+        """
+        surface = self.render()
+        cached = self._scaled
+        if cached is not None and cached[0] == (scale_x, scale_y):
+            return cached[1]
+
+        width, height = surface.get_size()
+        size = (max(1, round(width * scale_x)), max(1, round(height * scale_y)))
+        try:
+            scaled = pygame.transform.smoothscale(surface, size)
+        except ValueError:
+            # smoothscale chỉ hỗ trợ bề mặt 24 hoặc 32 bit
+            scaled = pygame.transform.scale(surface, size)
+        # Chỉ lưu bản co giãn khi nội dung đã được lưu đệm: invalidate() xóa cả hai
+        if self._cached is not None:
+            self._scaled = ((scale_x, scale_y), scaled)
+            tracker.update(self)
+        return scaled
+
+    def _parts(self):
+        """
+        Trả về các widget được vẽ trực tiếp bởi widget này nhưng không nằm trong children (ví dụ textbox của Input).
+        Return the widgets drawn directly by this widget that are not in children (e.g. the textbox of an Input).
+        """
+        return ()
+
+    def release_surfaces(self):
+        """
+        Giải phóng bề mặt của widget và các đối tượng con. Chúng sẽ được tạo lại ở lần vẽ tiếp theo.
+        Release the surfaces of the widget and its children. They are recreated on the next render.
+        """
+        self._release_own_surfaces()
+        for _, child in self.children:
+            child.release_surfaces()
+
+    def destroy(self):
+        """
+        Hủy widget và toàn bộ cây con: giải phóng bề mặt và trả lại ID để có thể dùng lại.
+        Destroy the widget and its whole subtree: release the surfaces and free the IDs for reuse.
+        """
+        for _, child in self.children:
+            child.destroy()
+        self.children = ()
+        self._parent = None
+        self._deferred = None
+        self._release_own_surfaces()
+        Widget._used_ids.discard(self.id)
+
+    def get_size(self):
+        """
+        Trả về kích thước của bề mặt mà widget vẽ ra.
+        Returns the size of the surface drawn by the widget.
+        Returns:
+            tuple: (width, height).
+        """
+        return self.width, self.height
+
+    def resize(self, width, height):
+        """
+        Thay đổi kích thước của widget. Bề mặt sẽ được tạo lại ở lần vẽ tiếp theo.
+        Change the size of the widget. The surfaces are recreated on the next render.
+        Parameters:
+            width (int): Chiều rộng mới.
+            height (int): Chiều cao mới.
+        """
+        self.width = width
+        self.height = height
+        self._release_own_surfaces()
+        self.invalidate()
+
     def add_child(self, location, child_object):
         """
         Thêm một đối tượng con vào widget.
@@ -97,20 +458,48 @@ class Widget(ABC):
             location (tuple): Vị trí của đối tượng con trên widget.
             child_object (Widget): Đối tượng con cần thêm.
         """
-        if not hasattr(self, 'children'):
+        # Danh sách con chỉ được tạo khi có đối tượng con đầu tiên
+        if not isinstance(self.children, list):
             self.children = []
         self.children.append((location, child_object))
+        parent = child_object._parent
+        if parent is None:
+            child_object._parent = self
+        elif parent is not self and (type(parent) is not tuple or self not in parent):
+            # Cùng một widget nằm trong nhiều widget cha (hiếm): lưu tất cả các widget cha trong một tuple
+            child_object._parent = (parent if type(parent) is tuple else (parent,)) + (self,)
+        self.invalidate()
+
+    def defer_children(self, factory):
+        """
+        Trì hoãn việc tạo các đối tượng con cho tới khi widget được hiển thị lần đầu.
+        Defer the creation of the children until the widget is displayed for the first time.
+        Parameters:
+            factory (callable): Hàm nhận widget và thêm các đối tượng con vào nó.
+        """
+        self._deferred = factory
+
+    def _visible_children(self):
+        """
+        Duyệt các đối tượng con đang hiển thị. Đối tượng con bị ẩn quá lâu được giải phóng bởi tracker.next_frame().
+        Iterate over the visible children. Children hidden for too long are released by tracker.next_frame().
+        """
+        for location, child in self.children:
+            if child.visible:
+                child._last_drawn = tracker.frame
+                if child._deferred is not None:
+                    factory, child._deferred = child._deferred, None
+                    factory(child)
+                yield location, child
 
     def _draw_children(self):
         """
         Vẽ tất cả các đối tượng con của widget.
         Draw all child objects of the widget.
         """
-        if self.SURFACE and hasattr(self, 'children'):
-            for location, child in self.children:
-                self.SURFACE.blit(child.print(), location)
-                if isinstance(child, Widget):
-                    child._draw_children()
+        if self.SURFACE:
+            for location, child in self._visible_children():
+                self.SURFACE.blit(child.render(), location)
 
 
 class Screen(Widget):
@@ -119,6 +508,13 @@ class Screen(Widget):
     The Screen class represents the display app of the application.
     """
 
+    __slots__ = ('width', 'height', 'caption', 'resizable', 'offscreen', 'display_size', 'scale_mode', '_scale',
+                 'workers', '_executor', '_initialized')
+
+    # Màn hình luôn giữ bề mặt hiển thị
+    # The screen always keeps its display surface
+    _SURFACE_ATTRS = ()
+
     _instance = None
 
     def __new__(cls, *args, **kwargs):
@@ -130,18 +526,33 @@ class Screen(Widget):
             cls._instance = super().__new__(cls)
         return cls._instance
 
-    def __init__(self, width=800, height=600, caption="PyScript App"):
+    def __init__(self, width=800, height=600, caption="PyScript App", resizable=False, offscreen=False,
+                 display_size=None, scale_mode='fit'):
         """
         Khởi tạo màn hình với kích thước và tiêu đề đã cho.
         Initialize the app with the given size and caption.
+        Parameters:
+            offscreen (bool): Vẽ lên một bề mặt thường thay vì mở cửa sổ hiển thị.
+                Render to a plain surface instead of opening a display window.
+            display_size (tuple): Kích thước vật lý của màn hình. Khi được đặt, width và height là độ phân giải
+                thiết kế và cây widget được co giãn tới màn hình; (0, 0) dùng kích thước màn hình hiện tại.
+                Physical size of the display. When set, width and height are the design resolution and the
+                widget tree is scaled to the display; (0, 0) uses the current desktop size.
+            scale_mode (str): 'fit' giữ tỷ lệ khung hình, 'stretch' lấp đầy màn hình.
+                'fit' keeps the aspect ratio, 'stretch' fills the display.
         """
         if not hasattr(self, '_initialized'):
             super().__init__("_screen")
             self.width = width
             self.height = height
             self.caption = caption
-            self.SURFACE = None
-            self.children = []
+            self.resizable = resizable
+            self.offscreen = offscreen
+            self.display_size = display_size
+            self.scale_mode = scale_mode
+            self._scale = (1, 1, 0, 0)
+            self.workers = 1
+            self._executor = None
             self._initialized = True
 
     def print(self):
@@ -151,13 +562,131 @@ class Screen(Widget):
         Returns:
             pygame.Surface: Bề mặt hiển thị của màn hình.
         """
+        tracker.next_frame()
         if self.SURFACE is None:
-            self.SURFACE = pygame.display.set_mode((self.width, self.height))
-            pygame.display.set_caption(self.caption)
+            size = self.display_size or (self.width, self.height)
+            if self.offscreen:
+                self.SURFACE = pygame.Surface(size if all(size) else (self.width, self.height))
+            else:
+                self.SURFACE = pygame.display.set_mode(size, pygame.RESIZABLE if self.resizable else 0)
+                pygame.display.set_caption(self.caption)
+            self._scale = self._compute_scale(*self.SURFACE.get_size())
         self.SURFACE.fill(pygame.Color('gray'))
-        self._draw_children()
+        if self.workers > 1:
+            self._draw_children_parallel()
+        elif self.display_size is None:
+            self._draw_children()
+        else:
+            self._draw_scaled_children()
         return self.SURFACE
 
+    def set_workers(self, workers):
+        """
+        Bật chế độ vẽ song song: các cây con cấp cao nhất (Window, Form, ...) được vẽ lên bề mặt riêng
+        trên một nhóm luồng rồi ghép lên màn hình theo thứ tự. pygame nhả GIL khi fill và blit.
+        Các cây con cấp cao nhất không được dùng chung widget với nhau.
+        Enable parallel rendering: the top-level subtrees (Window, Form, ...) are rendered to their own
+        surfaces on a thread pool and then merged onto the display in order. pygame releases the GIL in
+        fill and blit. The top-level subtrees must not share widgets with each other.
+        Parameters:
+            workers (int): Số luồng (1 để tắt).
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        self.workers = workers
+
+    def _draw_children_parallel(self):
+        """
+        Vẽ song song các đối tượng con cấp cao nhất rồi ghép chúng theo thứ tự z.
+        Render the top-level children in parallel, then merge them in z-order.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='compositor')
+        scale_x, scale_y, offset_x, offset_y = self._scale
+        scaled = self.display_size is not None
+
+        children = list(self._visible_children())
+        futures = [self._executor.submit(child.render_scaled, scale_x, scale_y) if scaled
+                   else self._executor.submit(child.render) for _, child in children]
+        for (location, _), future in zip(children, futures):
+            if scaled:
+                location = (offset_x + round(location[0] * scale_x), offset_y + round(location[1] * scale_y))
+            self.SURFACE.blit(future.result(), location)
+
+    def _compute_scale(self, display_width, display_height):
+        """
+        Tính tỷ lệ và độ lệch từ độ phân giải thiết kế tới màn hình vật lý.
+        Compute the scale and offset from the design resolution to the physical display.
+        Returns:
+            tuple: (scale_x, scale_y, offset_x, offset_y).
+        """
+        scale_x = display_width / self.width
+        scale_y = display_height / self.height
+        if self.scale_mode == 'fit':
+            scale_x = scale_y = min(scale_x, scale_y)
+        return (scale_x, scale_y, (display_width - round(self.width * scale_x)) // 2,
+                (display_height - round(self.height * scale_y)) // 2)
+
+    def _draw_scaled_children(self):
+        """
+        Vẽ các đối tượng con cấp cao nhất đã được co giãn tới màn hình vật lý.
+        Draw the top-level children scaled to the physical display.
+        """
+        scale_x, scale_y, offset_x, offset_y = self._scale
+        for location, child in self._visible_children():
+            self.SURFACE.blit(child.render_scaled(scale_x, scale_y),
+                              (offset_x + round(location[0] * scale_x), offset_y + round(location[1] * scale_y)))
+
+    @staticmethod
+    def to_logical(position):
+        """
+        Chuyển tọa độ trên màn hình vật lý (ví dụ vị trí chuột) sang tọa độ thiết kế.
+        Convert a physical display position (e.g. the mouse position) to design coordinates.
+        Parameters:
+            position (tuple): Tọa độ vật lý.
+        Returns:
+            tuple: Tọa độ thiết kế.
+        """
+        scale_x, scale_y, offset_x, offset_y = Screen()._scale
+        return int((position[0] - offset_x) / scale_x), int((position[1] - offset_y) / scale_y)
+
+    def resize(self, width, height):
+        """
+        Thay đổi kích thước màn hình (ví dụ khi nhận sự kiện VIDEORESIZE).
+        Khi dùng độ phân giải thiết kế, chỉ kích thước vật lý thay đổi. Ngược lại các layout cấp cao nhất có
+        fill = True được co giãn tới phần màn hình còn lại từ vị trí của chúng và được sắp xếp lại ở lần vẽ tiếp theo.
+        Change the size of the screen (e.g. when receiving a VIDEORESIZE event).
+        When a design resolution is used, only the physical size changes. Otherwise the top-level layouts with
+        fill = True are resized to the rest of the screen from their location and re-laid out on the next render.
+        Parameters:
+            width (int): Chiều rộng mới.
+            height (int): Chiều cao mới.
+        """
+        if self.display_size is not None:
+            self.display_size = (width, height)
+        else:
+            self.width = width
+            self.height = height
+            for location, child in self.children:
+                if getattr(child, 'fill', False):
+                    child.resize(max(1, width - location[0]), max(1, height - location[1]))
+        self.SURFACE = None
+
+    def clone(self, id=None):
+        raise TypeError("Screen là duy nhất và không thể sao chép.")
+
+    def destroy(self):
+        """
+        Hủy toàn bộ cây widget và thể hiện Screen hiện tại. Lần gọi Screen() tiếp theo sẽ tạo màn hình mới.
+        Destroy the whole widget tree and the current Screen instance. The next Screen() call creates a new screen.
+        """
+        super().destroy()
+        self.set_workers(1)
+        self.SURFACE = None
+        if Screen._instance is self:
+            Screen._instance = None
+
     @staticmethod
     def getElementById(search_id):
         """
@@ -221,21 +750,22 @@ class Screen(Widget):
             search_id (str): ID của đối tượng cần thay đổi vị trí.
             new_location (tuple): Vị trí mới của đối tượng.
         """
-        if not Screen._change_location_helper(search_id, new_location, Screen().children):
+        if not Screen._change_location_helper(search_id, new_location, Screen()):
             raise ValueError(f"ID '{search_id}' không tồn tại.")
 
     @staticmethod
-    def _change_location_helper(search_id, new_location, children):
+    def _change_location_helper(search_id, new_location, parent):
         """
         Phương thức trợ giúp để thay đổi đệ quy vị trí của đối tượng con.
         Helper method to recursively change the location of the child object.
         """
-        for index, (location, child) in enumerate(children):
+        for index, (location, child) in enumerate(parent.children):
             if child.id == search_id:
-                children[index] = (new_location, child)
+                parent.children[index] = (new_location, child)
+                parent.invalidate()
                 return True
             else:
-                if Screen._change_location_helper(search_id, new_location, child.children):
+                if Screen._change_location_helper(search_id, new_location, child):
                     return True
         return False
 
@@ -310,6 +840,8 @@ class Container(Widget):
     This class represents a container for objects in the user interface.
     """
 
+    __slots__ = ('width', 'height', 'background_color')
+
     def __init__(self, width, height, background_color=pygame.Color('white'), id=None):
         """
         Khởi tạo một container mới với kích thước và màu nền đã cho.
@@ -323,7 +855,9 @@ class Container(Widget):
         self.width = width
         self.height = height
         self.background_color = background_color
-        self.SURFACE = pygame.Surface((width, height))
+
+    def _allocate_surfaces(self):
+        self.SURFACE = pool.acquire((self.width, self.height))
 
     def print(self):
         """
@@ -332,6 +866,7 @@ class Container(Widget):
         Returns:
             pygame.Surface: Bề mặt hiển thị của container.
         """
+        self._ensure_surfaces()
         self.SURFACE.fill(self.background_color)
         self._draw_children()
         return self.SURFACE
@@ -343,6 +878,16 @@ class Window(Widget):
     The Window class represents a window similar to a Windows operating system window.
     """
 
+    __slots__ = ('width', 'height', 'title', 'background_color', 'title_height', 'title_bar', 'close_button',
+                 'minimize_button')
+
+    _SURFACE_ATTRS = ('SURFACE', 'title_bar', 'close_button', 'minimize_button')
+    _SHARED_ATTRS = ('title_bar', 'close_button', 'minimize_button')
+
+    # Kích thước của các nút trên thanh tiêu đề
+    # Size of the title bar buttons
+    BUTTON_SIZE = 20
+
     def __init__(self, width, height, title="", background_color=pygame.Color('white'), id=None):
         """
         Khởi tạo một cửa sổ mới.
@@ -360,20 +905,62 @@ class Window(Widget):
         self.title = title
         self.background_color = background_color
         self.title_height = 20
-        self.SURFACE = pygame.Surface((width, height + self.title_height))
+        self.title_bar = None
+        self.close_button = None
+        self.minimize_button = None
+
+    def get_size(self):
+        return self.width, self.height + self.title_height
+
+    def hit_test(self, position):
+        """
+        Xác định phần của cửa sổ tại một vị trí (tính từ góc trên bên trái của cửa sổ).
+        Determine the part of the window at a position (relative to the top left corner of the window).
+        Parameters:
+            position (tuple): Vị trí cần kiểm tra.
+        Returns:
+            str or None: 'close', 'minimize', 'title', 'body' hoặc None nếu nằm ngoài cửa sổ.
+        """
+        x, y = position
+        width, height = self.get_size()
+        if not (0 <= x < width and 0 <= y < height):
+            return None
+        if y >= self.title_height:
+            return 'body'
+        if x >= width - self.BUTTON_SIZE:
+            return 'close'
+        if x >= width - 2 * self.BUTTON_SIZE:
+            return 'minimize'
+        return 'title'
+
+    def resize(self, width, height):
+        super().resize(width, height - self.title_height)
+
+    def _allocate_surfaces(self):
+        width = self.width
+        self.SURFACE = pool.acquire((width, self.height + self.title_height))
+        if self.title_bar is not None:
+            # Thanh tiêu đề dùng chung với widget gốc
+            return
 
         # Thêm thanh tiêu đề màu xanh
-        self.title_bar = pygame.Surface((width, self.title_height))
+        self.title_bar = pool.acquire((width, self.title_height))
         self.title_bar.fill((0, 128, 255))
 
         # Thêm tiêu đề của cửa sổ
-        font = pygame.font.Font(None, 16)
-        title_text = font.render(title, True, pygame.Color('white'))
+        font = _cached_font(None, 16)
+        title_text = _render_text(font, self.title, pygame.Color('white'))
         title_rect = title_text.get_rect(center=(width // 2, self.title_height // 2))
         self.title_bar.blit(title_text, title_rect)
 
+        # Thêm nút thu nhỏ (gạch ngang) bên trái nút đóng
+        self.minimize_button = pool.acquire((self.BUTTON_SIZE, self.BUTTON_SIZE))
+        self.minimize_button.fill((0, 100, 220))
+        pygame.draw.line(self.minimize_button, pygame.Color('white'), (5, 14), (15, 14), 2)
+        self.title_bar.blit(self.minimize_button, (width - 2 * self.BUTTON_SIZE, 0))
+
         # Thêm nút đóng (nút X đỏ)
-        self.close_button = pygame.Surface((20, 20))
+        self.close_button = pool.acquire((self.BUTTON_SIZE, self.BUTTON_SIZE))
         self.close_button.fill(pygame.Color('red'))
         pygame.draw.line(self.close_button, pygame.Color('white'), (5, 5), (15, 15), 2)
         pygame.draw.line(self.close_button, pygame.Color('white'), (5, 15), (15, 5), 2)
@@ -387,6 +974,7 @@ class Window(Widget):
         Returns:
             pygame.Surface: Bề mặt hiển thị của cửa sổ.
         """
+        self._ensure_surfaces()
         self.SURFACE.fill(self.background_color)
         self.SURFACE.blit(self.title_bar, (0, 0))
         self._draw_children()
@@ -394,9 +982,8 @@ class Window(Widget):
         return self.SURFACE
 
     def _draw_children(self):
-        if hasattr(self, 'children'):
-            for location, child in self.children:
-                self.SURFACE.blit(child.print(), (location[0], location[1] + self.title_height))
+        for location, child in self._visible_children():
+            self.SURFACE.blit(child.render(), (location[0], location[1] + self.title_height))
 
 
 class Image(Widget):
@@ -405,6 +992,11 @@ class Image(Widget):
     The Image class represents a widget displaying an image.
     """
 
+    __slots__ = ('image_filename', 'image_path', 'image', 'width', 'height')
+
+    _SURFACE_ATTRS = ('image',)
+    _SHARED_ATTRS = ('image',)
+
     IMAGE_DIRECTORY = os.path.join(os.path.dirname(__file__) + "/..", 'static', 'images')
 
     def __init__(self, image_filename, width, height, id=None):
@@ -418,12 +1010,21 @@ class Image(Widget):
             id (str): ID của widget.
         """
         super().__init__(id)
+        self.image_filename = image_filename
         self.image_path = os.path.join(self.IMAGE_DIRECTORY, image_filename)
-        self.image = pygame.image.load(self.image_path)
-        self.image = pygame.transform.scale(self.image, (width, height))
+        self.image = None
         self.width = width
         self.height = height
 
+    def _allocate_surfaces(self):
+        bundle = active_bundle()
+        self.image = bundle.image(self.image_filename, self.image_path) if bundle else None
+        if self.image is None:
+            self.image = pygame.image.load(self.image_path)
+        if self.image.get_size() != (self.width, self.height):
+            # Cùng kích thước thì giữ nguyên bề mặt (với bundle là bề mặt dùng chung bộ nhớ, không sao chép)
+            self.image = pygame.transform.scale(self.image, (self.width, self.height))
+
     def print(self):
         """
         Phương thức để vẽ hình ảnh.
@@ -431,6 +1032,7 @@ class Image(Widget):
         Returns:
             pygame.Surface: Bề mặt hiển thị của hình ảnh.
         """
+        self._ensure_surfaces()
         return self.image
 
 
@@ -440,6 +1042,11 @@ class Button(Widget):
     The Button class represents a button widget in the user interface.
     """
 
+    __slots__ = ('text', 'width', 'height', 'background_color', 'text_color', 'font', 'surface')
+
+    _SURFACE_ATTRS = ('surface',)
+    _SHARED_ATTRS = ('surface',)
+
     def __init__(self, text, width, height, background_color, text_color, font, id=None):
         """
         Khởi tạo một nút mới.
@@ -460,12 +1067,14 @@ class Button(Widget):
         self.background_color = background_color
         self.text_color = text_color
         self.font = font
+        self.surface = None
 
-        self.surface = pygame.Surface((width, height))
-        self.surface.fill(background_color)
+    def _allocate_surfaces(self):
+        self.surface = pool.acquire((self.width, self.height))
+        self.surface.fill(self.background_color)
 
-        text_surface = font.render(text, True, text_color)
-        text_rect = text_surface.get_rect(center=(width // 2, height // 2))
+        text_surface = _render_text(self.font, self.text, self.text_color)
+        text_rect = text_surface.get_rect(center=(self.width // 2, self.height // 2))
         self.surface.blit(text_surface, text_rect)
 
     def print(self):
@@ -475,6 +1084,7 @@ class Button(Widget):
         Returns:
             pygame.Surface: Bề mặt hiển thị của nút.
         """
+        self._ensure_surfaces()
         return self.surface
 
 
@@ -484,6 +1094,11 @@ class Text(Widget):
     The Text class represents a widget displaying text.
     """
 
+    __slots__ = ('text', 'font', 'color', 'surface')
+
+    _SURFACE_ATTRS = ('surface',)
+    _SHARED_ATTRS = ('surface',)
+
     def __init__(self, text, font, color, id=None):
         """
         Khởi tạo một widget hiển thị văn bản.
@@ -498,8 +1113,20 @@ class Text(Widget):
         self.text = text
         self.font = font
         self.color = color
+        self.surface = None
+
+    def get_size(self):
+        if self.surface is not None:
+            return self.surface.get_size()
+        with _font_lock:
+            return self.font.size(self.text)
 
-        self.surface = font.render(text, True, color)
+    def resize(self, width, height):
+        # Kích thước của văn bản do font và nội dung quyết định
+        pass
+
+    def _allocate_surfaces(self):
+        self.surface = _render_text(self.font, self.text, self.color)
 
     def print(self):
         """
@@ -508,6 +1135,7 @@ class Text(Widget):
         Returns:
             pygame.Surface: Bề mặt hiển thị của văn bản.
         """
+        self._ensure_surfaces()
         return self.surface
 
 
@@ -517,6 +1145,11 @@ class Rectangle(Widget):
     The Rectangle class represents a rectangle widget in the user interface.
     """
 
+    __slots__ = ('width', 'height', 'color', 'surface')
+
+    _SURFACE_ATTRS = ('surface',)
+    _SHARED_ATTRS = ('surface',)
+
     def __init__(self, width, height, color, id=None):
         """
         Khởi tạo một widget hình chữ nhật.
@@ -531,10 +1164,12 @@ class Rectangle(Widget):
         self.width = width
         self.height = height
         self.color = color
+        self.surface = None
 
+    def _allocate_surfaces(self):
         # Tạo bề mặt hình chữ nhật
-        self.surface = pygame.Surface((width, height))
-        self.surface.fill(color)
+        self.surface = pool.acquire((self.width, self.height))
+        self.surface.fill(self.color)
 
     def print(self):
         """
@@ -543,6 +1178,7 @@ class Rectangle(Widget):
         Returns:
             pygame.Surface: Bề mặt hiển thị của hình chữ nhật.
         """
+        self._ensure_surfaces()
         return self.surface
 
 
@@ -552,6 +1188,11 @@ class RectangleText(Widget):
     The RectangleText class represents a rectangle widget with text inside in the user interface.
     """
 
+    __slots__ = ('text', 'width', 'height', 'color', 'text_color', 'font', 'surface')
+
+    _SURFACE_ATTRS = ('surface',)
+    _SHARED_ATTRS = ('surface',)
+
     def __init__(self, text, width, height, color, text_color, font, id=None):
         """
         Khởi tạo một widget hình chữ nhật với văn bản bên trong.
@@ -572,14 +1213,16 @@ class RectangleText(Widget):
         self.color = color
         self.text_color = text_color
         self.font = font
+        self.surface = None
 
+    def _allocate_surfaces(self):
         # Tạo bề mặt hình chữ nhật
-        self.surface = pygame.Surface((width, height))
-        self.surface.fill(color)
+        self.surface = pool.acquire((self.width, self.height))
+        self.surface.fill(self.color)
 
         # Vẽ văn bản lên hình chữ nhật
-        text_surface = font.render(text, True, text_color)
-        text_rect = text_surface.get_rect(center=(width // 2, height // 2))
+        text_surface = _render_text(self.font, self.text, self.text_color)
+        text_rect = text_surface.get_rect(center=(self.width // 2, self.height // 2))
         self.surface.blit(text_surface, text_rect)
 
     def print(self):
@@ -589,15 +1232,39 @@ class RectangleText(Widget):
         Returns:
             pygame.Surface: Bề mặt hiển thị của hình chữ nhật với văn bản.
         """
+        self._ensure_surfaces()
         return self.surface
 
 
-class Circle(Widget):
+class _Round(Widget):
+    """
+    Lớp cơ sở cho các widget hình tròn: kích thước được tính từ bán kính.
+    Base class for the circle widgets: the size is derived from the radius.
+    """
+
+    __slots__ = ()
+
+    def get_size(self):
+        return self.radius * 2, self.radius * 2
+
+    def resize(self, width, height):
+        # Hình tròn giữ nguyên tỷ lệ: bán kính theo cạnh ngắn hơn
+        self.radius = max(1, min(width, height) // 2)
+        self._release_own_surfaces()
+        self.invalidate()
+
+
+class Circle(_Round):
     """
     Lớp Circle đại diện cho một widget hình tròn trên giao diện người dùng.
     The Circle class represents a circle widget in the user interface.
     """
 
+    __slots__ = ('radius', 'color', 'surface')
+
+    _SURFACE_ATTRS = ('surface',)
+    _SHARED_ATTRS = ('surface',)
+
     def __init__(self, radius, color, id=None):
         """
         Khởi tạo một widget hình tròn.
@@ -610,11 +1277,14 @@ class Circle(Widget):
         super().__init__(id)
         self.radius = radius
         self.color = color
+        self.surface = None
 
+    def _allocate_surfaces(self):
         # Tạo bề mặt hình tròn
+        radius = self.radius
         diameter = radius * 2
-        self.surface = pygame.Surface((diameter, diameter), pygame.SRCALPHA)
-        pygame.draw.circle(self.surface, color, (radius, radius), radius)
+        self.surface = pool.acquire((diameter, diameter), pygame.SRCALPHA)
+        pygame.draw.circle(self.surface, self.color, (radius, radius), radius)
 
     def print(self):
         """
@@ -623,15 +1293,21 @@ class Circle(Widget):
         Returns:
             pygame.Surface: Bề mặt hiển thị của hình tròn.
         """
+        self._ensure_surfaces()
         return self.surface
 
 
-class CircleText(Widget):
+class CircleText(_Round):
     """
     Lớp CircleText đại diện cho một widget hình tròn với văn bản bên trong trên giao diện người dùng.
     The CircleText class represents a circle widget with text inside in the user interface.
     """
 
+    __slots__ = ('text', 'radius', 'color', 'text_color', 'font', 'surface')
+
+    _SURFACE_ATTRS = ('surface',)
+    _SHARED_ATTRS = ('surface',)
+
     def __init__(self, text, radius, color, text_color, font, id=None):
         """
         Khởi tạo một widget hình tròn với văn bản bên trong.
@@ -650,14 +1326,17 @@ class CircleText(Widget):
         self.color = color
         self.text_color = text_color
         self.font = font
+        self.surface = None
 
+    def _allocate_surfaces(self):
         # Tạo bề mặt hình tròn
+        radius = self.radius
         diameter = radius * 2
-        self.surface = pygame.Surface((diameter, diameter), pygame.SRCALPHA)
-        pygame.draw.circle(self.surface, color, (radius, radius), radius)
+        self.surface = pool.acquire((diameter, diameter), pygame.SRCALPHA)
+        pygame.draw.circle(self.surface, self.color, (radius, radius), radius)
 
         # Vẽ văn bản lên hình tròn
-        text_surface = font.render(text, True, text_color)
+        text_surface = _render_text(self.font, self.text, self.text_color)
         text_rect = text_surface.get_rect(center=(radius, radius))
         self.surface.blit(text_surface, text_rect)
 
@@ -668,6 +1347,7 @@ class CircleText(Widget):
         Returns:
             pygame.Surface: Bề mặt hiển thị của hình tròn với văn bản.
         """
+        self._ensure_surfaces()
         return self.surface
 
 
@@ -677,6 +1357,11 @@ class Textbox(Widget):
     The Textbox class represents a text input box in the user interface.
     """
 
+    __slots__ = ('width', 'height', 'text', 'font_name', 'font_size', 'text_color', 'background_color', 'font',
+                 'surface')
+
+    _SURFACE_ATTRS = ('surface',)
+
     def __init__(self, width, height, text='', font_name='Arial', font_size=24, text_color=(0, 0, 0),
                  background_color=(255, 255, 255), id=None):
         """
@@ -701,17 +1386,23 @@ class Textbox(Widget):
         self.font_size = font_size
         self.text_color = text_color
         self.background_color = background_color
-        self.font = pygame.font.SysFont(font_name, font_size)
-        self.surface = pygame.Surface((width, height))
-        self.render_text()
+        self.font = None
+        self.surface = None
+
+    def _allocate_surfaces(self):
+        if self.font is None:
+            with _font_lock:
+                self.font = pygame.font.SysFont(self.font_name, self.font_size)
+        self.surface = pool.acquire((self.width, self.height))
 
     def render_text(self):
         """
         Vẽ văn bản lên bề mặt textbox.
         Renders the text onto the textbox surface.
         """
+        self._ensure_surfaces()
         self.surface.fill(self.background_color)
-        text_surface = self.font.render(self.text, True, self.text_color)
+        text_surface = _render_text(self.font, self.text, self.text_color)
         self.surface.blit(text_surface, (5, (self.height - text_surface.get_height()) // 2 + 1))
 
     def print(self):
@@ -734,7 +1425,8 @@ class Textbox(Widget):
             text (str): Văn bản mới.
         """
         self.text = text
-        self.render_text()
+        if self._allocated:
+            self.render_text()
 
 
 class Checkbox(Widget):
@@ -743,6 +1435,10 @@ class Checkbox(Widget):
     The Checkbox class represents a checkbox in the user interface.
     """
 
+    __slots__ = ('size', 'is_checked', 'border_color', 'check_color', 'background_color', 'surface')
+
+    _SURFACE_ATTRS = ('surface',)
+
     def __init__(self, size, is_checked=False, border_color=(0, 0, 0), check_color=(0, 0, 0),
                  background_color=(255, 255, 255), id=None):
         """
@@ -763,14 +1459,26 @@ class Checkbox(Widget):
         self.border_color = border_color
         self.check_color = check_color
         self.background_color = background_color
-        self.surface = pygame.Surface((size, size))
-        self.render_checkbox()
+        self.surface = None
+
+    def get_size(self):
+        return self.size, self.size
+
+    def resize(self, width, height):
+        # Checkbox luôn là hình vuông
+        self.size = max(1, min(width, height))
+        self._release_own_surfaces()
+        self.invalidate()
+
+    def _allocate_surfaces(self):
+        self.surface = pool.acquire((self.size, self.size))
 
     def render_checkbox(self):
         """
         Vẽ checkbox lên bề mặt.
         Renders the checkbox onto the surface.
         """
+        self._ensure_surfaces()
         self.surface.fill(self.background_color)
         pygame.draw.rect(self.surface, self.border_color, (0, 0, self.size, self.size), 2)
         if self.is_checked:
@@ -794,7 +1502,8 @@ class Checkbox(Widget):
         Toggles the state of the checkbox.
         """
         self.is_checked = not self.is_checked
-        self.render_checkbox()
+        if self._allocated:
+            self.render_checkbox()
 
 
 class Form(Widget):
@@ -803,6 +1512,12 @@ class Form(Widget):
     The Form class represents a form with a border and header.
     """
 
+    __slots__ = ('width', 'height', 'title', 'targeted', 'header_height', 'border_color', 'header_color',
+                 'header_font', 'header')
+
+    _SURFACE_ATTRS = ('SURFACE', 'header')
+    _SHARED_ATTRS = ('header',)
+
     def __init__(self, width, height, title, targeted=False, id=None):
         """
         Khởi tạo một form mới với khung viền và header.
@@ -820,15 +1535,29 @@ class Form(Widget):
         self.title = title
         self.targeted = targeted
         self.header_height = 20
-        self.SURFACE = pygame.Surface((width, height + self.header_height))
         self.border_color = pygame.Color('black') if targeted else pygame.Color('gray')
         self.header_color = pygame.Color(230, 230, 230)
-        self.header_font = pygame.font.Font(None, 16)
+        self.header_font = None
+        self.header = None
+
+    def get_size(self):
+        return self.width, self.height + self.header_height
+
+    def resize(self, width, height):
+        super().resize(width, height - self.header_height)
+
+    def _allocate_surfaces(self):
+        self.SURFACE = pool.acquire((self.width, self.height + self.header_height))
+        if self.header is not None:
+            # Header dùng chung với widget gốc
+            return
+        if self.header_font is None:
+            self.header_font = _cached_font(None, 16)
 
         # Vẽ header
-        self.header = pygame.Surface((width, self.header_height))
+        self.header = pool.acquire((self.width, self.header_height))
         self.header.fill(self.header_color)
-        title_text = self.header_font.render(title, True, pygame.Color('black'))
+        title_text = _render_text(self.header_font, self.title, pygame.Color('black'))
         self.header.blit(title_text, (5, 5))
 
     def print(self):
@@ -838,6 +1567,7 @@ class Form(Widget):
         Returns:
             pygame.Surface: Bề mặt hiển thị của form.
         """
+        self._ensure_surfaces()
         self.SURFACE.fill(pygame.Color('white'))
         self.SURFACE.blit(self.header, (0, 0))
         pygame.draw.rect(self.SURFACE, self.border_color, self.SURFACE.get_rect(), 2)
@@ -846,9 +1576,8 @@ class Form(Widget):
         return self.SURFACE
 
     def _draw_children(self):
-        if hasattr(self, 'children'):
-            for location, child in self.children:
-                self.SURFACE.blit(child.print(), (location[0], location[1] + self.header_height))
+        for location, child in self._visible_children():
+            self.SURFACE.blit(child.render(), (location[0], location[1] + self.header_height))
 
 
 class Input(Widget):
@@ -857,6 +1586,12 @@ class Input(Widget):
     The Input class represents an input widget with a label and a textbox.
     """
 
+    __slots__ = ('height', 'label_text', 'width', 'font_size', 'targeted', 'background_color', 'targeted_color',
+                 'border_color', 'font', 'h', 'label_width', 'label', 'textbox')
+
+    _SURFACE_ATTRS = ('SURFACE', 'label')
+    _SHARED_ATTRS = ('label',)
+
     def __init__(self, label_text, width, value='', font_size=16, targeted=False, background_color=(240, 255, 240),
                  targeted_color=(192, 192, 192), id=None):
         """
@@ -873,7 +1608,6 @@ class Input(Widget):
             id (str): ID của input.
         """
         super().__init__(id)
-        self.height = None
         self.label_text = label_text
         self.width = width
         self.font_size = font_size
@@ -881,21 +1615,51 @@ class Input(Widget):
         self.background_color = background_color
         self.targeted_color = targeted_color
         self.border_color = pygame.Color('black') if targeted else pygame.Color('gray')
-        self.font = pygame.font.Font(None, font_size)
-        label_width, label_height = self.font.size(label_text)
-        self.h = label_height
-
-        self.SURFACE = pygame.Surface((width + label_width + 10, self.h + 4))
-
-        # Vẽ label
-        self.label = self.font.render(label_text, True, pygame.Color('black'))
+        self.font = _cached_font(None, font_size)
+        with _font_lock:
+            self.label_width, self.h = self.font.size(label_text)
+        self.height = self.h + 4
+        self.label = None
 
         # Sử dụng Textbox
         self.textbox = Textbox(self.width, self.h, value, id, font_size=self.font_size)
+        self.textbox._parent = self
         self.textbox.background_color = pygame.Color(*background_color) \
             if not targeted \
             else pygame.Color(targeted_color)
 
+    def get_size(self):
+        return self.width + self.label_width + 10, self.height
+
+    def resize(self, width, height):
+        # Chiều cao của input phụ thuộc vào cỡ chữ
+        super().resize(width - self.label_width - 10, self.height)
+        self.textbox.resize(self.width, self.textbox.height)
+
+    def _allocate_surfaces(self):
+        self.SURFACE = pool.acquire(self.get_size())
+
+        # Vẽ label (nếu chưa dùng chung với widget gốc)
+        if self.label is None:
+            self.label = _render_text(self.font, self.label_text, pygame.Color('black'))
+
+    def clone(self, id=None):
+        widget = super().clone(id)
+        widget.textbox = self.textbox.clone()
+        widget.textbox._parent = widget
+        return widget
+
+    def _parts(self):
+        return (self.textbox,)
+
+    def release_surfaces(self):
+        super().release_surfaces()
+        self.textbox.release_surfaces()
+
+    def destroy(self):
+        super().destroy()
+        self.textbox.destroy()
+
     def print(self):
         """
         Phương thức để vẽ input và tất cả các đối tượng con trên đó.
@@ -903,11 +1667,13 @@ class Input(Widget):
         Returns:
             pygame.Surface: Bề mặt hiển thị của input.
         """
+        self._ensure_surfaces()
         self.SURFACE.fill(pygame.Color('white'))
         self.SURFACE.blit(self.label, (3, 3))
-        self.SURFACE.blit(self.textbox.print(), (self.label.get_width() + 10, 2))
+        # Textbox không nằm trong children nên được đánh dấu đã vẽ tại đây để không bị giải phóng khi đang hiển thị
+        self.textbox._last_drawn = tracker.frame
+        self.SURFACE.blit(self.textbox.render(), (self.label.get_width() + 10, 2))
         pygame.draw.rect(self.SURFACE, self.border_color, self.SURFACE.get_rect(), 2)
-        self.height = self.SURFACE.get_size()[1]
         return self.SURFACE
 
     @property
@@ -924,4 +1690,4 @@ class Input(Widget):
         Thiết lập giá trị của thuộc tính text của textbox.
         Sets the value of the text attribute of the textbox.
         """
-        self.textbox.text = new_value
+        self.textbox.set_text(new_value)
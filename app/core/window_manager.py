@@ -0,0 +1,182 @@
+import pygame
+
+from .widgets import Screen, Window
+
+
+class WindowManager:
+    """
+    Lớp WindowManager xử lý các cửa sổ cấp cao nhất trên Screen: kéo bằng thanh tiêu đề, đưa lên trên cùng khi
+    được chọn, thu nhỏ và đóng.
+    The WindowManager class handles the top-level windows on the Screen: dragging by the title bar, raising
+    on focus, minimizing and closing.
+    Di chuyển không thay đổi nội dung của cửa sổ nên bề mặt đã vẽ của nó được dùng lại (xem Widget.render):
+    mỗi khung hình khi kéo chỉ tốn một lần blit.
+    Moving does not change the content of a window so its rendered surface is reused (see Widget.render):
+    each frame of a drag costs a single blit.
+    """
+
+    def __init__(self):
+        self.focused = None
+        self._drag = None
+
+    @staticmethod
+    def _windows():
+        """
+        Duyệt các đối tượng con đang hiển thị của Screen từ trên xuống dưới.
+        Iterate over the visible children of the Screen from top to bottom.
+        """
+        for location, child in reversed(Screen().children):
+            if child.visible:
+                yield location, child
+
+    def window_at(self, position):
+        """
+        Trả về cửa sổ trên cùng tại một vị trí trên màn hình.
+        Return the topmost window at a screen position.
+        Parameters:
+            position (tuple): Vị trí theo tọa độ thiết kế.
+        Returns:
+            tuple or None: (cửa sổ, vị trí của cửa sổ), hoặc None nếu vị trí không nằm trên cửa sổ nào.
+        """
+        for location, child in self._windows():
+            width, height = child.get_size()
+            if location[0] <= position[0] < location[0] + width and location[1] <= position[1] < location[1] + height:
+                # Widget khác nằm trên cùng thì cửa sổ phía dưới không nhận sự kiện
+                return (child, location) if isinstance(child, Window) else None
+        return None
+
+    def handle_event(self, event):
+        """
+        Xử lý sự kiện chuột cho các cửa sổ. Gọi trong event_scripts.
+        Handle mouse events for the windows. Call from event_scripts.
+        Parameters:
+            event (pygame.event.Event): Sự kiện cần xử lý.
+        Returns:
+            bool: True nếu sự kiện đã được xử lý (thanh tiêu đề, nút đóng, nút thu nhỏ hoặc đang kéo).
+        """
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            position = Screen.to_logical(event.pos)
+            found = self.window_at(position)
+            if found is None:
+                return False
+            window, location = found
+            self.focus(window.id)
+            part = window.hit_test((position[0] - location[0], position[1] - location[1]))
+            if part == 'close':
+                self.close(window.id)
+            elif part == 'minimize':
+                self.minimize(window.id)
+            elif part == 'title':
+                self._start_drag(window, location, position)
+            else:
+                # Nhấp vào thân cửa sổ vẫn được chuyển cho các script của ứng dụng
+                return False
+            return True
+
+        if event.type == pygame.MOUSEMOTION and self._drag is not None:
+            window, offset = self._drag
+            self.move(window.id, Screen.to_logical(event.pos), offset)
+            return True
+
+        if event.type == pygame.MOUSEBUTTONUP and event.button == 1 and self._drag is not None:
+            self._drag = None
+            return True
+        return False
+
+    def _start_drag(self, window, location, position):
+        """
+        Bắt đầu kéo cửa sổ, ghi nhớ điểm được kéo trên cửa sổ.
+        Start dragging a window, remembering the grabbed point on the window.
+        """
+        self._drag = (window, (position[0] - location[0], position[1] - location[1]))
+
+    def move(self, id, position, offset=(0, 0)):
+        """
+        Di chuyển cửa sổ sao cho điểm offset của nó nằm tại position. Thanh tiêu đề luôn được giữ trong màn hình.
+        Move a window so that its offset point is at position. The title bar is always kept on the screen.
+        Parameters:
+            id (str): ID của cửa sổ.
+            position (tuple): Vị trí theo tọa độ thiết kế.
+            offset (tuple): Điểm được kéo, tính từ góc trên bên trái của cửa sổ.
+        """
+        screen = Screen()
+        window = Screen.getElementById(id)
+        width = window.get_size()[0]
+        x = min(max(position[0] - offset[0], 2 * Window.BUTTON_SIZE - width), screen.width - 2 * Window.BUTTON_SIZE)
+        y = min(max(position[1] - offset[1], 0), screen.height - window.title_height)
+        Screen.change_location(id, (x, y))
+
+    def focus(self, id):
+        """
+        Chọn cửa sổ và đưa nó lên trên cùng.
+        Focus a window and raise it to the top.
+        Parameters:
+            id (str): ID của cửa sổ.
+        """
+        screen = Screen()
+        for index, (location, child) in enumerate(screen.children):
+            if child.id == id:
+                if index != len(screen.children) - 1:
+                    del screen.children[index]
+                    screen.children.append((location, child))
+                    screen.invalidate()
+                self.focused = child
+                return
+        raise ValueError(f"ID '{id}' không tồn tại.")
+
+    def minimize(self, id):
+        """
+        Thu nhỏ cửa sổ: ẩn nó và giải phóng ngay bề mặt của cửa sổ và các đối tượng con.
+        Minimize a window: hide it and release the surfaces of the window and its children right away.
+        Parameters:
+            id (str): ID của cửa sổ.
+        """
+        window = Screen.getElementById(id)
+        if self._drag is not None and self._drag[0] is window:
+            self._drag = None
+        window.visible = False
+        window.release_surfaces()
+        if self.focused is window:
+            self.focused = None
+
+    def restore(self, id):
+        """
+        Hiển thị lại cửa sổ đã thu nhỏ và đưa nó lên trên cùng. Bề mặt được tạo lại ở lần vẽ tiếp theo.
+        Show a minimized window again and raise it to the top. The surfaces are recreated on the next render.
+        Parameters:
+            id (str): ID của cửa sổ.
+        """
+        window = Screen.getElementById(id)
+        window.visible = True
+        self.focus(id)
+
+    def minimized(self):
+        """
+        Trả về danh sách các cửa sổ đang thu nhỏ.
+        Return the list of minimized windows.
+        """
+        return [child for _, child in Screen().children if isinstance(child, Window) and not child.visible]
+
+    def close(self, id):
+        """
+        Đóng cửa sổ: gỡ nó khỏi Screen và hủy toàn bộ cây con (giải phóng bề mặt và ID).
+        Close a window: remove it from the Screen and destroy its whole subtree (releasing surfaces and IDs).
+        Parameters:
+            id (str): ID của cửa sổ.
+        """
+        screen = Screen()
+        for index, (_, child) in enumerate(screen.children):
+            if child.id == id:
+                del screen.children[index]
+                screen.invalidate()
+                break
+        else:
+            raise ValueError(f"ID '{id}' không tồn tại.")
+        if self._drag is not None and self._drag[0] is child:
+            self._drag = None
+        if self.focused is child:
+            self.focused = None
+        child.destroy()
+
+
+window_manager = WindowManager()
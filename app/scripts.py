@@ -7,6 +7,7 @@ from pygame.locals import *
 from .core.widgets import *
 
 from .core.config import config
+from .core.window_manager import window_manager
 
 
 def event_scripts(event: pygame.event.Event):
@@ -14,6 +15,13 @@ def event_scripts(event: pygame.event.Event):
         pygame.quit()
         sys.exit()
 
+    if event.type == VIDEORESIZE:
+        Screen().resize(event.w, event.h)
+
+    # Kéo, thu nhỏ và đóng cửa sổ
+    if window_manager.handle_event(event):
+        return
+
     if event.type == KEYDOWN:
         print(Screen.root_location('cont'))
         pass